@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+
+import sys
+import random
+import argparse
+import timeit
+import functools
+# third-party modules:
+import networkx as nx
+# modules I've written:
+from py3algs.algorithms import dijkstra_sssp
+from py3algs.datastructs import binary_heap
+from py3algs.datastructs import pairing_heap
+from py3algs.datastructs import fibonacci_heap
+from py3algs.datastructs import bucket_queue
+from py3algs.datastructs import radix_heap
+
+
+def make_graph(num_nodes, num_edges, seed):
+    """
+    Create a random undirected graph with random integer edge weights.
+    
+    num_nodes -- number of nodes 
+    num_edges -- number of edges 
+    seed -- the random number generator seed 
+    
+    Edge weights will be random integers in the range [0, 99] inclusive, 
+    like in profile_dijkstra_sssp.py.
+    """
+    # (if we use the same seed every time, we get the same graph)
+    graph = nx.gnm_random_graph(num_nodes, num_edges, seed=seed,
+                                directed=False)
+    # (again we use a seed so we get the same weights every time)
+    random.seed(seed)
+    for _, _, edge_attrs in graph.edges_iter(data=True):
+        edge_attrs['weight'] = random.randint(0, 99)
+    return graph
+
+
+def heap_types():
+    """
+    Return a list of (name, heap_type) tuples for the heaps we compare.
+    
+    Use a dense graph (e.g. `-n 1500 -m 500000`) to see the heaps with 
+    decrease_key at their best.
+    """
+    result = [('BinaryHeap', binary_heap.BinaryHeap)]
+    for arity in (2, 3, 4, 8, 16):
+        result.append(('DaryHeap(arity={})'.format(arity), 
+                       functools.partial(binary_heap.DaryHeap, arity=arity)))
+    # these two use decrease_key instead of duplicate entries
+    result.append(('PairingHeap', pairing_heap.PairingHeap))
+    result.append(('FibonacciHeap', fibonacci_heap.FibonacciHeap))
+    # these two only work for non-negative integer weights, like ours
+    result.append(('BucketQueue', 
+                   functools.partial(bucket_queue.BucketQueue, 99)))
+    result.append(('RadixHeap', radix_heap.RadixHeap))
+    # let dijkstra_sssp pick one
+    result.append(('heap_type=None', None))
+    return result
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Compare heap types inside dijkstra_sssp.')
+    parser.add_argument('-n', '--num-nodes', default=10000, type=int, 
+                        help='number of nodes in the graph (default 10000)')
+    parser.add_argument('-m', '--num-edges', default=100000, type=int, 
+                        help='number of edges in the graph (default 100000)')
+    parser.add_argument('-s', '--seed', default=0, type=int, 
+                        help='the random number generator seed (default 0)')
+    parser.add_argument('-r', '--repeat', default=5, type=int, 
+                        help='number of timed runs per heap (default 5)')
+    args = parser.parse_args()
+    return args
+
+
+def main(args):
+    graph = make_graph(args.num_nodes, args.num_edges, args.seed)
+    print('n = {}, m = {}; best of {} runs:'.format(args.num_nodes, 
+                                                    args.num_edges, 
+                                                    args.repeat))
+    for name, heap_type in heap_types():
+        run = functools.partial(dijkstra_sssp.solve, graph, 0, 
+                                weight='weight', heap_type=heap_type)
+        best = min(timeit.repeat(run, number=1, repeat=args.repeat))
+        print('{:<24} {:.3f} s'.format(name, best))
+    return 0
+
+
+if __name__ == "__main__":
+    status = main(parse_args())
+    sys.exit(status)
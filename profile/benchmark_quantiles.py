@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+
+import sys
+import random
+import argparse
+import timeit
+import bisect
+# third-party modules:
+import numpy
+# modules I've written:
+from py3algs.datastructs import median_maintainer
+from py3algs.datastructs import quantile_sketch
+
+
+def make_items(num_items, seed):
+    """
+    Return a list of random floats (normally distributed).
+    
+    num_items -- number of items
+    seed -- the random number generator seed
+    """
+    # (if we use the same seed every time, we get the same items)
+    rng = random.Random(seed)
+    return [rng.gauss(0, 1) for _ in range(num_items)]
+
+
+def exact_median(items):
+    maintainer = median_maintainer.MedianMaintainer()
+    for item in items:
+        maintainer.insert(item)
+    return maintainer.median(), len(maintainer)
+
+
+def sketch_median(items, k, seed):
+    sketch = quantile_sketch.KLLSketch(k, seed)
+    for item in items:
+        sketch.update(item)
+    return sketch.median(), sketch.num_retained
+
+
+def sketch_median_many(array, k, seed):
+    sketch = quantile_sketch.KLLSketch(k, seed)
+    sketch.update_many(array)
+    return sketch.median(), sketch.num_retained
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Compare MedianMaintainer with KLLSketch.')
+    parser.add_argument('-n', '--num-items', default=10**6, type=int, 
+                        help='number of items in the stream (default 10^6)')
+    parser.add_argument('-k', default=200, type=int, 
+                        help='the sketch size (default 200)')
+    parser.add_argument('-s', '--seed', default=0, type=int, 
+                        help='the random number generator seed (default 0)')
+    parser.add_argument('-r', '--repeat', default=3, type=int, 
+                        help='number of timed runs per method (default 3)')
+    args = parser.parse_args()
+    return args
+
+
+def main(args):
+    items = make_items(args.num_items, args.seed)
+    array = numpy.array(items)
+    sorted_items = sorted(items)
+    print('n = {}, k = {}; best of {} runs:'.format(args.num_items, args.k, 
+                                                    args.repeat))
+    runs = [
+        ('MedianMaintainer', lambda: exact_median(items)),
+        ('KLLSketch.update', 
+         lambda: sketch_median(items, args.k, args.seed)),
+        ('KLLSketch.update_many', 
+         lambda: sketch_median_many(array, args.k, args.seed)),
+    ]
+    for name, run in runs:
+        best = min(timeit.repeat(run, number=1, repeat=args.repeat))
+        median, num_kept = run()
+        rank = bisect.bisect_right(sorted_items, median) / len(items)
+        print('{:<24} {:.3f} s, {:>8} items kept, median rank {:.4f}'.format(
+              name, best, num_kept, rank))
+    return 0
+
+
+if __name__ == "__main__":
+    status = main(parse_args())
+    sys.exit(status)
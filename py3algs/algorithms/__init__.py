@@ -1,7 +1,7 @@
 __all__ = ['bellman_ford_sssp', 'binary_exponentiation', 'binary_search', \
            'count_inversions', 'dijkstra_sssp', 'diophantine', \
-           'euclidean_alg', 'johnsons_apsp', 'karger_min_cut', \
-           'knapsack', 'kosaraju_scc', 'quickselect', 'quicksort', \
-           'sat2', 'tsp', 'two_three_sum']
+           'dynamic_connectivity', 'euclidean_alg', 'johnsons_apsp', \
+           'karger_min_cut', 'knapsack', 'kosaraju_scc', 'mst', \
+           'quickselect', 'quicksort', 'sat2', 'tsp', 'two_three_sum']
 
 from . import *
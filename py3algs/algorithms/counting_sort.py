@@ -33,9 +33,10 @@ Date:
 
 
 from collections import Counter
+from itertools import chain
 
 
-__all__ = ['sort']
+__all__ = ['sort', 'sort_indices']
 
 
 def sort(sequence, values):
@@ -53,3 +54,25 @@ def sort(sequence, values):
     for value in values:
         result.extend([value] * count_per_value[value])
     return result
+
+
+def sort_indices(keys, max_key):
+    """
+    Return the indices of `keys` ordered by key, using counting sort.
+    
+    keys -- a sequence of integers in the range [0, max_key]
+    max_key -- an upper bound for the keys
+    
+    Returns a list with the indices 0, 1, ..., N-1 ordered so that their 
+    keys are in non-decreasing order. The sort is stable, i.e. indices with 
+    equal keys stay in increasing order.
+    
+    Useful for sorting records (e.g. a graph's edges) by a small integer 
+    key (e.g. their weight). Complexity is O(N + K), where K is max_key.
+    """
+    buckets = [[] for _ in range(max_key + 1)]
+    # bind the buckets' append methods once, instead of once per key
+    appends = [bucket.append for bucket in buckets]
+    for index, key in enumerate(keys):
+        appends[key](index)
+    return list(chain.from_iterable(buckets))
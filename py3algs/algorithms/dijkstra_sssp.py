@@ -6,9 +6,12 @@ compute and return shortest s-t paths for every node "t" in the graph.
 We assume that the given graph has non-negative edge weights. If some 
 edges have negative weights this algorithm's behavior is undefined.
 
-Currently implemented using a pseudo-heap, which is essentially a python 
-dictionary. insert and decrease_key are (amortized) constant time, while 
-pop (i.e. pop_min) takes linear time.
+Implemented using a heap: a bucket queue or a radix heap if all edge 
+weights are non-negative integers, binary_heap.BinaryHeap otherwise. Heaps 
+without decrease_key get a new (dist, node) entry each time a node's 
+distance drops, and old entries are skipped when popped. Heaps with 
+decrease_key (e.g. pairing_heap.PairingHeap or fibonacci_heap.FibonacciHeap)
+keep a single entry per node and decrease it instead.
 
 Author:
   Christos Nitsas
@@ -24,13 +27,20 @@ Date:
 
 
 import collections
+import functools
 # Modules I've written:
 from ..datastructs import binary_heap
+from ..datastructs import bucket_queue
+from ..datastructs import radix_heap
 
 
 __all__ = ['DistAndPred', 'solve', 'dijkstra_shortest_paths']
 
 
+# max edge weights up to this always get a bucket queue
+_SMALL_MAX_WEIGHT = 16
+
+
 DistAndPred = collections.namedtuple('DistAndPred', ['dist', 'pred'])
 
 
@@ -55,8 +65,38 @@ def _init(graph):
     return dist, pred, finalized
 
 
-def dijkstra_shortest_paths(graph, source, weight='weight', 
-                            heap_type=binary_heap.BinaryHeap):
+def _pick_heap_type(graph, weight):
+    """
+    Pick the fastest heap type for the graph's edge weights.
+    
+    graph -- a networkx graph
+    weight -- the name of the edge attribute we'll use as a weight
+    
+    If all edge weights are non-negative integers, Dijkstra's algorithm 
+    only needs a monotone priority queue, and we can avoid comparisons:
+    - a bucket_queue.BucketQueue (Dial's algorithm) with C+1 buckets, 
+      where C is the max weight, takes O(m + n * C) time in the worst case 
+      (it may scan every distance up to (n-1) * C), so we only use it if 
+      C is tiny (at most _SMALL_MAX_WEIGHT) or n * C is at most m
+    - otherwise use a radix_heap.RadixHeap, which takes O(m + n * log(C))
+    Otherwise fall back to binary_heap.BinaryHeap.
+    """
+    max_weight = 0
+    num_edges = 0
+    for _, _, edge_attrs in graph.edges(data=True):
+        edge_weight = edge_attrs[weight]
+        if type(edge_weight) is not int or edge_weight < 0:
+            return binary_heap.BinaryHeap
+        if edge_weight > max_weight:
+            max_weight = edge_weight
+        num_edges += 1
+    if max_weight <= _SMALL_MAX_WEIGHT or \
+       max_weight * graph.number_of_nodes() <= num_edges:
+        return functools.partial(bucket_queue.BucketQueue, max_weight)
+    return radix_heap.RadixHeap
+
+
+def dijkstra_shortest_paths(graph, source, weight='weight', heap_type=None):
     """
     Compute shortest paths from the source using Dijkstra's algorithm.
     
@@ -64,8 +104,10 @@ def dijkstra_shortest_paths(graph, source, weight='weight',
     souce -- the source node
     weight -- the name of the edge attribute we'll use as a weight 
               (default: 'weight')
-    heap_type -- the type we'll use as a heap 
-                 (default: binary_heap.BinaryHeap, for now)
+    heap_type -- the type we'll use as a heap (default: None, i.e. pick 
+                 one based on the edge weights; see _pick_heap_type); if 
+                 its instances have a decrease_key method, insert must 
+                 return a handle that decrease_key accepts
     
     Careful: 
     All edge weights must be non-negative, for Dijkstra's algorithm to work 
@@ -80,8 +122,17 @@ def dijkstra_shortest_paths(graph, source, weight='weight',
     dist, pred, finalized = _init(graph)
     dist[source] = 0
     # initialize the heap
+    if heap_type is None:
+        heap_type = _pick_heap_type(graph, weight)
     heap = heap_type()
-    heap.insert((dist[source], source))
+    if hasattr(heap, 'decrease_key'):
+        # handles of the nodes' heap entries, for as long as they're in it
+        handles = dict()
+    else:
+        handles = None
+    entry = heap.insert((dist[source], source))
+    if handles is not None:
+        handles[source] = entry
     # main loop
     num_finalized = 0
     while num_finalized < graph.number_of_nodes() and len(heap) > 0:
@@ -94,12 +145,19 @@ def dijkstra_shortest_paths(graph, source, weight='weight',
         # u's dist won't get any lower; finalize it
         finalized[u] = True
         num_finalized += 1
+        if handles is not None:
+            del handles[u]
         # check if u's neighbors' dist is lower if we pass through u
         for _, v, edge_attrs in graph.edges(u, data=True):
             if dist[u] + edge_attrs[weight] < dist[v]:
                 dist[v] = dist[u] + edge_attrs[weight]
-                heap.insert((dist[v], v))
                 pred[v] = u
+                if handles is None:
+                    heap.insert((dist[v], v))
+                elif v in handles:
+                    heap.decrease_key(handles[v], (dist[v], v))
+                else:
+                    handles[v] = heap.insert((dist[v], v))
     return DistAndPred(dist, pred)
 
 
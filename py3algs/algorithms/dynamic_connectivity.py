@@ -0,0 +1,149 @@
+"""
+Offline dynamic connectivity.
+
+Given a sequence of edge insertions, edge deletions and connectivity 
+queries on a graph, answer all the queries. "Offline" means we know the 
+whole sequence of operations in advance.
+
+Every edge is present during some intervals of time. We put each interval
+in the O(log(m)) nodes of a segment tree over time that cover it, then walk
+the tree depth first with a Union-Find structure that can undo unions: at
+each node we join the endpoints of its edges, answer the queries at a leaf,
+and undo the node's unions on the way back up. For m operations on n items
+this takes O(m * log(m) * log(n)) time, instead of rebuilding the
+components after every deletion.
+
+Operations are tuples:
+- ('add', u, v) -- insert edge (u, v)
+- ('remove', u, v) -- delete (one copy of) edge (u, v)
+- ('connected', u, v) -- query whether u and v are connected
+- ('count',) -- query the number of connected components
+
+Author:
+  Christos Nitsas
+  (nitsas)
+  (chrisnitsas)
+
+Language:
+  Python 3(.4)
+
+Date:
+  October, 2026
+"""
+
+
+# modules I've written:
+from ..datastructs import union_find
+
+
+__all__ = ['offline_dynamic_connectivity', 'solve']
+
+
+def _edge_key(u, v):
+    """Return a key for the undirected edge (u, v)."""
+    return frozenset((u, v))
+
+
+def _edge_intervals(operations):
+    """
+    Return a list of (begin, end, u, v) tuples; edge (u, v) is present at 
+    every time t with begin <= t < end.
+    
+    operations -- a list of operation tuples (see the module docstring)
+    
+    Time t is the index of an operation. Raises a ValueError when removing 
+    an edge that isn't present, or on an unknown kind of operation.
+    """
+    # edge key -> list of insertion times of the currently present copies
+    present = dict()
+    intervals = []
+    for time, operation in enumerate(operations):
+        kind = operation[0]
+        if kind == 'add':
+            _, u, v = operation
+            present.setdefault(_edge_key(u, v), []).append(time)
+        elif kind == 'remove':
+            _, u, v = operation
+            try:
+                begin = present[_edge_key(u, v)].pop()
+            except (KeyError, IndexError):
+                raise ValueError('edge ({}, {}) removed at time {} but not '
+                                 'present'.format(u, v, time))
+            intervals.append((begin, time, u, v))
+        elif kind not in ('connected', 'count'):
+            raise ValueError('unknown operation {!r}'.format(kind))
+    # edges never removed stay until the end
+    for key, begins in present.items():
+        u, v = tuple(key) if len(key) == 2 else tuple(key) * 2
+        for begin in begins:
+            intervals.append((begin, len(operations), u, v))
+    return intervals
+
+
+def offline_dynamic_connectivity(items, operations):
+    """
+    Answer connectivity queries over a sequence of edge insertions and 
+    deletions.
+    
+    items -- an iterable of the graph's nodes (hashable)
+    operations -- a list of operation tuples (see the module docstring)
+    
+    Returns a list with the answer of each query, in order: a bool for a 
+    'connected' query and an int for a 'count' query.
+    
+    Uses a segment tree over time and a union_find.UnionFindWithRollback; 
+    the tree is walked with an explicit stack instead of recursion.
+    """
+    operations = list(operations)
+    num_times = len(operations)
+    if num_times == 0:
+        return []
+    # the segment tree: node k covers times [begin, end); its children are 
+    # 2k+1 and 2k+2; edges[k] holds the edges present throughout node k's 
+    # time range (but not its parent's)
+    edges = dict()
+    for begin, end, u, v in _edge_intervals(operations):
+        stack = [(0, 0, num_times)]
+        while len(stack) > 0:
+            node, node_begin, node_end = stack.pop()
+            if end <= node_begin or node_end <= begin:
+                # no overlap
+                continue
+            if begin <= node_begin and node_end <= end:
+                # full overlap
+                edges.setdefault(node, []).append((u, v))
+                continue
+            mid = (node_begin + node_end) // 2
+            stack.append((2 * node + 1, node_begin, mid))
+            stack.append((2 * node + 2, mid, node_end))
+    # walk the tree depth first, left to right
+    ufs = union_find.UnionFind(items, impl=union_find.UnionFindWithRollback)
+    answers = []
+    # entries are (node, begin, end, snapshot); snapshot is None when we 
+    # first enter a node, else it's the snapshot to roll back to on exit
+    stack = [(0, 0, num_times, None)]
+    while len(stack) > 0:
+        node, begin, end, snapshot = stack.pop()
+        if snapshot is not None:
+            # leaving the node; undo its unions
+            ufs.rollback(snapshot)
+            continue
+        stack.append((node, begin, end, ufs.snapshot()))
+        for u, v in edges.get(node, ()):
+            ufs.union(u, v)
+        if end - begin == 1:
+            # a leaf; answer the query at this time, if any
+            operation = operations[begin]
+            if operation[0] == 'connected':
+                answers.append(ufs.joined(operation[1], operation[2]))
+            elif operation[0] == 'count':
+                answers.append(ufs.num_clusters())
+            continue
+        mid = (begin + end) // 2
+        # push the right child first, so that the left child is visited first
+        stack.append((2 * node + 2, mid, end, None))
+        stack.append((2 * node + 1, begin, mid, None))
+    return answers
+
+
+solve = offline_dynamic_connectivity
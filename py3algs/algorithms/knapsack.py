@@ -15,14 +15,357 @@ Date:
 
 
 import collections
+import itertools
+import operator
+import time
+# modules I've written:
+from . import binary_search
+from ..datastructs import binary_heap
 
 
-__all__ = ['Item', 'KnapsackSolverWithCachingAndStack', 'Solver']
+__all__ = ['Item', 'Solution', 'KnapsackSolverWithCachingAndStack', 
+           'Solver', 'BranchAndBoundSolver', 'best_values', 
+           'solve_with_items', 'solve_many', 'solve_bounded', 
+           'solve_unbounded', 'solve_by_value', 'approximate']
 
 
 Item = collections.namedtuple('Item', ('value', 'size'))
 
 
+# the optimal value and the (sorted) indices of the items that achieve it
+Solution = collections.namedtuple('Solution', ('value', 'indices'))
+
+
+def best_values(items, knapsack_size, decisions=None):
+    """
+    Return the last row of the knapsack DP table as a list.
+    
+    items -- an iterable of Item namedtuples
+    knapsack_size -- an integer; the size of the knapsack
+    decisions -- if a list is given, append one decision row per item to it
+                 (default: None, i.e. don't record decisions)
+    
+    The result is a list `best` of length `knapsack_size + 1`, where 
+    `best[size]` is the max value we can fit in a knapsack of size `size`.
+    
+    Only a single row is kept in memory, so this needs O(W) space, where W 
+    is the knapsack size. Time complexity is O(n * W), where n is the number
+    of items.
+    
+    Each decision row is a bytearray; `decisions[i][size]` is 1 if the best 
+    subset of items[:i+1] for a knapsack of size `size` includes item i. 
+    Recording decisions needs O(n * W) bytes.
+    """
+    best = [0] * (knapsack_size + 1)
+    for item in items:
+        if item.size > knapsack_size:
+            # item doesn't fit in any knapsack we care about
+            if decisions is not None:
+                decisions.append(bytearray(knapsack_size + 1))
+            continue
+        # the values we'd get if we included the item; computed from the 
+        # previous row before we overwrite it, so each item is used once
+        with_item = [value + item.value 
+                     for value in best[:knapsack_size + 1 - item.size]]
+        if decisions is not None:
+            decisions.append(bytearray(item.size) + 
+                             bytearray(map(operator.gt, with_item, 
+                                           best[item.size:])))
+        best[item.size:] = map(max, best[item.size:], with_item)
+    return best
+
+
+def _chosen_items(items, decisions, knapsack_size):
+    """
+    Walk the decision rows backwards and return the chosen items' indices.
+    
+    items -- a list of Item namedtuples
+    decisions -- the decision rows recorded by best_values
+    knapsack_size -- an integer; the size of the knapsack we're interested 
+                     in (at most the size the decisions were recorded for)
+    """
+    chosen = []
+    for i in reversed(range(len(items))):
+        if decisions[i][knapsack_size]:
+            chosen.append(i)
+            knapsack_size -= items[i].size
+    chosen.reverse()
+    return chosen
+
+
+def solve_many(knapsack_sizes, items, with_items=False):
+    """
+    Solve the problem for many knapsack sizes at once.
+    
+    knapsack_sizes -- an iterable of integers; the knapsack sizes
+    items -- a list of Item namedtuples
+    with_items -- if truthy, also return the chosen items for each size 
+                  (default: False)
+    
+    Returns a list with one entry per knapsack size (in the given order): 
+    the optimal value if `with_items` is falsey, or a Solution namedtuple 
+    (value, indices) otherwise.
+    
+    Runs a single DP pass up to the largest knapsack size and answers every 
+    size from its last row, instead of solving each size independently. 
+    This needs O(n * W) time and O(W) memory, where W is the largest size; 
+    reconstructing the chosen items also needs O(n * W) bytes for the 
+    decision rows.
+    """
+    knapsack_sizes = list(knapsack_sizes)
+    if len(knapsack_sizes) == 0:
+        return []
+    max_size = max(knapsack_sizes)
+    if not with_items:
+        best = best_values(items, max_size)
+        return [best[size] for size in knapsack_sizes]
+    decisions = []
+    best = best_values(items, max_size, decisions)
+    return [Solution(best[size], _chosen_items(items, decisions, size)) 
+            for size in knapsack_sizes]
+
+
+def solve_with_items(knapsack_size, items):
+    """
+    Solve the problem and return the optimal value and the chosen items.
+    
+    knapsack_size -- an integer; the size of the knapsack
+    items -- a list of Item namedtuples
+    
+    Returns a Solution namedtuple (value, indices), where `indices` is a 
+    sorted list of indices into `items`.
+    
+    Uses Hirschberg-style divide and conquer: split the items in two halves, 
+    compute the last DP row of each half (see best_values) and pick the 
+    split of the knapsack size between the halves that maximizes the total 
+    value. Then solve the two halves independently, each with its share of 
+    the knapsack. This never keeps more than two DP rows in memory, i.e. 
+    it needs O(W) working memory instead of the O(n * W) table, at the cost 
+    of O(log(n)) times more work in the worst case.
+    
+    Uses a stack of subproblems instead of recursion.
+    """
+    chosen = []
+    value = None
+    # a stack of subproblems (begin, end, size), i.e. items[begin:end] with 
+    # a knapsack of size `size`
+    stack = [(0, len(items), knapsack_size)]
+    while len(stack) > 0:
+        (begin, end, size) = stack.pop()
+        if end - begin == 0:
+            continue
+        if end - begin == 1:
+            # a single item; take it if it fits and is worth anything
+            if items[begin].size <= size and items[begin].value > 0:
+                chosen.append(begin)
+            continue
+        mid = (begin + end) // 2
+        front = best_values(items[begin:mid], size)
+        back = best_values(items[mid:end], size)
+        # how much of the knapsack should go to the first half?
+        split = max(range(size + 1), key=lambda s: front[s] + back[size - s])
+        if value is None:
+            # the top level subproblem's value is the optimal value
+            value = front[split] + back[size - split]
+        stack.append((begin, mid, split))
+        stack.append((mid, end, size - split))
+    if value is None:
+        # zero or one items
+        value = sum(items[i].value for i in chosen)
+    chosen.sort()
+    return Solution(value, chosen)
+
+
+def _min_sizes(items, knapsack_size):
+    """
+    Compute the value-indexed DP; return the min sizes and the decisions.
+    
+    items -- a list of Item namedtuples; values must be non-negative integers
+    knapsack_size -- an integer; the size of the knapsack
+    
+    Returns a tuple (min_size, decisions), where:
+    - min_size[value] is the min total size of a subset of items with total 
+      value exactly `value` (infinity if there is no such subset)
+    - decisions[i][value] is 1 if, after considering items[:i+1], the best 
+      subset for `value` includes item i; 0 otherwise
+    
+    Items that don't fit in the knapsack or are worth nothing are skipped.
+    Each decision row is a bytearray, i.e. one byte per table cell.
+    """
+    inf = float('inf')
+    total = sum(item.value for item in items 
+                if item.size <= knapsack_size and item.value > 0)
+    min_size = [0] + [inf] * total
+    decisions = []
+    # the highest value we can reach using the items considered so far
+    reachable = 0
+    for item in items:
+        row = bytearray(total + 1)
+        decisions.append(row)
+        if item.size > knapsack_size or item.value <= 0:
+            continue
+        reachable += item.value
+        # the sizes we'd need if we included the item; computed from the 
+        # previous row before we overwrite it, so each item is used once
+        with_item = [size + item.size 
+                     for size in min_size[:reachable + 1 - item.value]]
+        for value, size in enumerate(with_item, item.value):
+            if size < min_size[value]:
+                min_size[value] = size
+                row[value] = 1
+    return min_size, decisions
+
+
+def _binary_split(items, counts):
+    """
+    Split bounded items into 0/1 pieces of 1, 2, 4, ... copies each.
+    
+    items -- a list of Item namedtuples
+    counts -- a list of non-negative integers; counts[i] is the number of 
+              available copies of items[i]
+    
+    Returns a tuple (pieces, owners, copies) of lists, where pieces[j] is an 
+    Item that stands for copies[j] copies of items[owners[j]].
+    
+    An item with count c is split into pieces of 1, 2, 4, ..., 2**(k-1) and 
+    `c - 2**k + 1` copies, where k is the largest integer with 
+    `2**k - 1 <= c`. Any number of copies from 0 to c is the sum of a subset 
+    of the pieces, so a 0/1 knapsack over the pieces solves the bounded 
+    problem with O(log(c)) pieces per item instead of c.
+    """
+    pieces, owners, copies = [], [], []
+    for i, (item, count) in enumerate(zip(items, counts)):
+        if count < 0:
+            raise ValueError('counts must be non-negative')
+        piece = 1
+        while count > 0:
+            piece = min(piece, count)
+            pieces.append(Item(item.value * piece, item.size * piece))
+            owners.append(i)
+            copies.append(piece)
+            count -= piece
+            piece *= 2
+    return pieces, owners, copies
+
+
+def solve_bounded(knapsack_size, items, counts):
+    """
+    Solve the bounded Knapsack problem, where each item has many copies.
+    
+    knapsack_size -- an integer; the size of the knapsack
+    items -- a list of Item namedtuples
+    counts -- a list of non-negative integers; counts[i] is the number of 
+              available copies of items[i]
+    
+    Returns a Solution namedtuple (value, indices), where `indices` is a 
+    sorted list of indices into `items`; an index appears once for each 
+    copy of the item we chose.
+    
+    Uses binary splitting (see _binary_split) and solves the resulting 0/1 
+    problem with solve_with_items, so this needs O(W * sum(log(c))) time 
+    and O(W) working memory, where W is the knapsack size and c goes 
+    through the counts.
+    """
+    pieces, owners, copies = _binary_split(items, counts)
+    value, chosen_pieces = solve_with_items(knapsack_size, pieces)
+    chosen = []
+    for j in chosen_pieces:
+        chosen.extend([owners[j]] * copies[j])
+    chosen.sort()
+    return Solution(value, chosen)
+
+
+def solve_unbounded(knapsack_size, items):
+    """
+    Solve the unbounded Knapsack problem, where each item has endless copies.
+    
+    knapsack_size -- an integer; the size of the knapsack
+    items -- a list of Item namedtuples
+    
+    Returns a Solution namedtuple (value, indices), where `indices` is a 
+    sorted list of indices into `items`; an index appears once for each 
+    copy of the item we chose.
+    
+    No more than `W // size` copies of an item fit in the knapsack, so this 
+    is a bounded problem in disguise; see solve_bounded.
+    
+    Raises a ValueError if an item with zero size has a positive value, 
+    since the optimal value would then be infinite.
+    """
+    counts = []
+    for item in items:
+        if item.size == 0:
+            if item.value > 0:
+                raise ValueError('unbounded value; zero sized item with '
+                                 'positive value')
+            counts.append(0)
+        else:
+            counts.append(knapsack_size // item.size)
+    return solve_bounded(knapsack_size, items, counts)
+
+
+def solve_by_value(knapsack_size, items):
+    """
+    Solve the problem using a DP table indexed by value instead of size.
+    
+    knapsack_size -- an integer; the size of the knapsack
+    items -- a list of Item namedtuples; values must be non-negative integers
+    
+    Returns a Solution namedtuple (value, indices), where `indices` is a 
+    sorted list of indices into `items`.
+    
+    For each achievable total value we compute the min total size of items 
+    that achieves it; the answer is the highest value whose min size fits. 
+    Time complexity is O(n * V) and memory is O(n * V) bytes, where V is the 
+    sum of the item values. This does not depend on the knapsack size at 
+    all, so it's the way to go for huge sizes and small values.
+    """
+    min_size, decisions = _min_sizes(items, knapsack_size)
+    value = max(v for v, size in enumerate(min_size) if size <= knapsack_size)
+    # walk the decisions backwards to recover the chosen items
+    chosen = []
+    remaining = value
+    for i in reversed(range(len(items))):
+        if decisions[i][remaining]:
+            chosen.append(i)
+            remaining -= items[i].value
+    chosen.reverse()
+    return Solution(value, chosen)
+
+
+def approximate(knapsack_size, items, epsilon):
+    """
+    Approximately solve the problem, using a FPTAS.
+    
+    knapsack_size -- an integer; the size of the knapsack
+    items -- a list of Item namedtuples; values must be non-negative
+    epsilon -- a number; 0 < epsilon < 1 must hold
+    
+    Returns a Solution namedtuple (value, indices), where `indices` is a 
+    sorted list of indices into `items`. The value is at least 
+    `(1 - epsilon)` times the optimal value.
+    
+    We scale all values down by `epsilon * max_value / n` and round them 
+    down, then solve the scaled problem exactly with solve_by_value. The 
+    scaled values add up to at most `n**2 / epsilon`, so this needs 
+    O(n**3 / epsilon) time and memory, no matter how big the sizes and 
+    values are.
+    """
+    if not 0 < epsilon < 1:
+        raise ValueError('0 < epsilon < 1 must hold')
+    fitting = [i for i, item in enumerate(items) 
+               if item.size <= knapsack_size and item.value > 0]
+    if len(fitting) == 0:
+        return Solution(0, [])
+    max_value = max(items[i].value for i in fitting)
+    scale = epsilon * max_value / len(fitting)
+    scaled_items = [Item(int(items[i].value // scale), items[i].size) 
+                    for i in fitting]
+    _, scaled_chosen = solve_by_value(knapsack_size, scaled_items)
+    chosen = [fitting[i] for i in scaled_chosen]
+    return Solution(sum(items[i].value for i in chosen), chosen)
+
+
 class KnapsackSolverWithCachingAndStack:
     """
     Solve the Knapsack problem, using memoization and a stack.
@@ -109,6 +452,169 @@ class KnapsackSolverWithCachingAndStack:
             # done with this subproblem
             stack.pop()
         return self._cache[(initial_query)]
+    
+    def solve_with_items(self):
+        """
+        Solve the problem and also return the items we chose.
+        
+        Returns a Solution namedtuple (value, indices), where `indices` is a 
+        sorted list of indices into `self.items`.
+        
+        This doesn't use (or fill) the cache; it needs only O(W) working 
+        memory, where W is the knapsack size. See solve_with_items.
+        """
+        return solve_with_items(self.knapsack_size, self.items)
 
 
 Solver = KnapsackSolverWithCachingAndStack
+
+
+class BranchAndBoundSolver:
+    """
+    Solve the Knapsack problem using best-first branch and bound.
+    
+    Useful for a few items with huge sizes, where a DP table indexed by 
+    either size or value would be too big.
+    
+    Items are sorted by value density (value / size) once. Each node of the 
+    search tree decides whether to include the next item in that order, and 
+    is bounded by the fractional (Dantzig) relaxation: fill the remaining 
+    room greedily by density and add a fraction of the first item that 
+    doesn't fit. Nodes are explored highest bound first, using a 
+    binary_heap.BinaryHeap as the frontier.
+    
+    The search can be cut short with a node limit or a time limit; we then 
+    return the best solution found so far (anytime behavior).
+    """
+    
+    def __init__(self, knapsack_size, items):
+        """
+        Initialize the problem.
+        
+        knapsack_size -- an integer; the size of the knapsack
+        items -- a list of Item namedtuples
+        items[i].size -- an integer; the i'th item's size
+        items[i].value -- a number; the i'th item's value
+        """
+        self.knapsack_size = knapsack_size
+        self.items = items
+        # was the last solution proven optimal?
+        self.optimal = False
+        # number of nodes the last solve explored
+        self.num_nodes = 0
+        # indices of useful items, in non-increasing order of value density
+        # (zero sized items first, they are free)
+        self._order = sorted(
+            (i for i, item in enumerate(items) 
+             if item.size <= knapsack_size and item.value > 0), 
+            key=lambda i: (items[i].size == 0, 
+                           items[i].value / max(items[i].size, 1)), 
+            reverse=True)
+        # prefix sums over the sorted order, used to compute bounds in 
+        # logarithmic time
+        self._prefix_size = [0]
+        self._prefix_value = [0]
+        for i in self._order:
+            self._prefix_size.append(self._prefix_size[-1] + items[i].size)
+            self._prefix_value.append(self._prefix_value[-1] + items[i].value)
+    
+    def _bound(self, level, value, room):
+        """
+        Return the fractional relaxation's value for a search node.
+        
+        level -- the number of (sorted) items we have decided on
+        value -- the value of the items we have included so far
+        room -- the knapsack size still available
+        """
+        # the first (sorted) item that doesn't fit if we greedily add items 
+        # from `level` onwards
+        target = self._prefix_size[level] + room
+        end = binary_search.bisect(self._prefix_size, target + 1, level) - 1
+        bound = value + self._prefix_value[end] - self._prefix_value[level]
+        if end < len(self._order):
+            # add the fitting fraction of the first item that doesn't fit
+            item = self.items[self._order[end]]
+            room_left = target - self._prefix_size[end]
+            bound += item.value * room_left / item.size
+        return bound
+    
+    def _greedy(self):
+        """
+        Return a greedy solution as a tuple (value, chosen).
+        
+        Go through the items by density and add every one that still fits.
+        `chosen` is a linked list of (index, rest) tuples, like the ones in 
+        search nodes.
+        """
+        value, room, chosen = 0, self.knapsack_size, None
+        for i in self._order:
+            if self.items[i].size <= room:
+                value += self.items[i].value
+                room -= self.items[i].size
+                chosen = (i, chosen)
+        return value, chosen
+    
+    def solve(self, max_nodes=None, time_limit=None):
+        """
+        Solve the problem and return the best solution found.
+        
+        max_nodes -- stop after exploring this many search nodes 
+                     (default: None, i.e. no limit)
+        time_limit -- stop after roughly this many seconds 
+                      (default: None, i.e. no limit)
+        
+        Returns a Solution namedtuple (value, indices), where `indices` is a 
+        sorted list of indices into `self.items`. After solving, 
+        `self.optimal` is True if the solution was proven optimal; False if 
+        we ran out of nodes or time first.
+        """
+        if time_limit is not None:
+            deadline = time.monotonic() + time_limit
+        best_value, best_chosen = self._greedy()
+        n = len(self._order)
+        # a tie-breaker, so that the heap never compares the chosen items
+        counter = itertools.count()
+        # a max heap of (bound, value, tie-breaker, level, room, chosen), 
+        # where chosen is a linked list of (index, rest) tuples
+        frontier = binary_heap.BinaryHeap(max_=True)
+        frontier.insert((self._bound(0, 0, self.knapsack_size), 0, 
+                         next(counter), 0, self.knapsack_size, None))
+        self.num_nodes = 0
+        # if the frontier runs out (or can't beat the best solution) we have 
+        # proven optimality
+        self.optimal = True
+        while len(frontier) > 0:
+            if (max_nodes is not None and self.num_nodes >= max_nodes) or \
+               (time_limit is not None and time.monotonic() >= deadline):
+                self.optimal = False
+                break
+            bound, value, _, level, room, chosen = frontier.pop()
+            if bound <= best_value:
+                # the best remaining node can't beat what we have
+                break
+            self.num_nodes += 1
+            if level == n:
+                continue
+            item = self.items[self._order[level]]
+            # branch 1: include the item (if it fits)
+            if item.size <= room:
+                with_chosen = (self._order[level], chosen)
+                with_value = value + item.value
+                with_room = room - item.size
+                if with_value > best_value:
+                    best_value, best_chosen = with_value, with_chosen
+                with_bound = self._bound(level + 1, with_value, with_room)
+                if with_bound > best_value:
+                    frontier.insert((with_bound, with_value, next(counter), 
+                                     level + 1, with_room, with_chosen))
+            # branch 2: exclude the item
+            without_bound = self._bound(level + 1, value, room)
+            if without_bound > best_value:
+                frontier.insert((without_bound, value, next(counter), 
+                                 level + 1, room, chosen))
+        indices = []
+        while best_chosen is not None:
+            index, best_chosen = best_chosen
+            indices.append(index)
+        indices.sort()
+        return Solution(best_value, indices)
@@ -1,3 +1,5 @@
-__all__ = ['union_find', 'median_maintainer', 'binary_heap']
+__all__ = ['union_find', 'median_maintainer', 'binary_heap', 'pairing_heap', \
+           'fibonacci_heap', 'bucket_queue', 'radix_heap', 'quantile_sketch', \
+           'binary_search_tree', 'sorted_list', 'serialization']
 
 from . import *
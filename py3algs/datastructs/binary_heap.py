@@ -1,11 +1,20 @@
 """
 A simple binary heap implementation (using a list).
 
+Also includes a d-ary heap implementation (DaryHeap), where each node has 
+up to d children instead of 2, and a binary heap that keeps numeric 
+priorities in a typed array, apart from the items (KeySplitHeap).
+
 Operations:  
 - __len__
 - insert 
 - pop
 - peek
+- extend
+- merge
+- pushpop
+- replace
+- nsmallest
 
 Author:  
   Christos Nitsas  
@@ -20,18 +29,22 @@ Date:
 """
 
 
+import array
 import operator
 
 
-__all__ = ['BinaryHeap', 'heapify']
+__all__ = ['BinaryHeap', 'DaryHeap', 'KeySplitHeap', 'heapify', 
+           'worth_heapifying']
 
 
-def heapify(list_, max_=False):
+def heapify(list_, max_=False, arity=2):
     """
-    Turn a list into a binary heap in place, in linear time.
+    Turn a list into a binary (or d-ary) heap in place, in linear time.
     
     list_ -- a list of items
     max_ -- if True, make a max-heap; min-heap otherwise (default)
+    arity -- the max number of children per node (default: 2, i.e. a 
+             binary heap)
     
     With the default `max_` parameter the lowest valued items are placed
     "higher" in the heap (the lowest valued item is the one returned by 
@@ -46,8 +59,29 @@ def heapify(list_, max_=False):
         less = operator.gt
     else:
         less = operator.lt
-    for i in reversed(range(n//2)):
-        _shift_down(list_, i, less)
+    if arity == 2:
+        for i in reversed(range(n//2)):
+            _shift_down(list_, i, less)
+    else:
+        if arity < 2:
+            raise ValueError('arity must be at least 2')
+        # the last node with children is the parent of the last node
+        for i in reversed(range((n - 2) // arity + 1)):
+            _dary_shift_down(list_, i, less, arity)
+
+
+def worth_heapifying(num_items, batch_size):
+    """
+    Return True if adding a batch to a heap is faster via heapify.
+    
+    num_items -- the number of items already in the heap
+    batch_size -- the number of items in the batch
+    
+    Inserting the batch one item at a time takes O(k * log(n + k)) time, 
+    while appending it and heapifying the whole list takes O(n + k) time.
+    """
+    total = num_items + batch_size
+    return batch_size * total.bit_length() > total
 
 
 def _swap(list_, a, b):
@@ -123,6 +157,64 @@ def _shift_down(list_, index, less):
                 return
 
 
+def _dary_shift_up(list_, index, less, arity):
+    """
+    Move a d-ary heap node up in the heap, as long as needed.
+    
+    list_ -- the heap as a list
+    index -- the index of the node in list_
+    less -- the callable we'll use to compare items
+    arity -- the max number of children per node
+    
+    Instead of swapping the item with each parent on the way, move the 
+    parents down one level and write the item once, at its final position.
+    """
+    item = list_[index]
+    while index > 0:
+        parent = (index - 1) // arity
+        if not less(item, list_[parent]):
+            break
+        list_[index] = list_[parent]
+        index = parent
+    list_[index] = item
+
+
+def _dary_shift_down(list_, index, less, arity):
+    """
+    Move a d-ary heap node down in the heap, as long as needed.
+    
+    list_ -- the heap as a list
+    index -- the index of the node in list_
+    less -- the callable we'll use to compare items; operator.lt for a 
+            min-heap or operator.gt for a max-heap
+    arity -- the max number of children per node
+    
+    Instead of swapping the item with its min child on the way, move the 
+    min children up one level and write the item once, at its final 
+    position. The min child is found with the builtin min (or max), so 
+    comparing a node's children doesn't cost d Python-level calls.
+    """
+    if less is operator.lt:
+        pick = min
+    else:
+        pick = max
+    n = len(list_)
+    item = list_[index]
+    while True:
+        first = arity * index + 1
+        if first >= n:
+            break
+        children = list_[first:first + arity]
+        # min (or max) returns the first of several equal children, and so 
+        # does index
+        min_child_item = pick(children)
+        if not less(min_child_item, item):
+            break
+        list_[index] = min_child_item
+        index = first + children.index(min_child_item)
+    list_[index] = item
+
+
 class BinaryHeap:
     """
     A simple binary heap implementation (using a list).
@@ -147,6 +239,7 @@ class BinaryHeap:
         A typical pattern for items is a tuple in the form: 
         (priority_number, data)
         """
+        self._max = max_
         if max_:
             self._less = operator.gt
         else:
@@ -210,3 +303,361 @@ class BinaryHeap:
         _shift_down(self._items, 0, self._less)
         # return
         return min_item
+    
+    def extend(self, iterable):
+        """
+        Insert all items from the given iterable.
+        
+        iterable -- an iterable of items
+        
+        If the batch is big compared to the heap (see worth_heapifying), 
+        append all items and re-heapify the whole list in linear time; 
+        otherwise insert them one by one.
+        """
+        batch = list(iterable)
+        num_items = len(self._items)
+        self._items.extend(batch)
+        if worth_heapifying(num_items, len(batch)):
+            heapify(self._items, self._max)
+        else:
+            for index in range(num_items, len(self._items)):
+                _shift_up(self._items, index, self._less)
+    
+    def merge(self, other_heap):
+        """
+        Insert all items of another heap into this one.
+        
+        other_heap -- a heap of the same type and ordering; it's left 
+                      unchanged
+        """
+        self.extend(other_heap._items)
+    
+    def pushpop(self, item):
+        """
+        Insert the item, then remove and return the item on top of the heap.
+        
+        Faster than an insert followed by a pop: if the new item would be on 
+        top, it's returned right away; otherwise it takes the top's place 
+        and is shifted down once.
+        """
+        if len(self._items) == 0 or not self._less(self._items[0], item):
+            return item
+        min_item = self._items[0]
+        self._items[0] = item
+        _shift_down(self._items, 0, self._less)
+        return min_item
+    
+    def replace(self, item):
+        """
+        Remove and return the item on top of the heap, then insert the item.
+        
+        Faster than a pop followed by an insert, since the new item takes 
+        the top's place and is shifted down once. The returned item may be 
+        "greater" than the new item.
+        
+        Raises a `LookupError('pop from empty heap')` if the heap is empty.
+        """
+        if len(self._items) == 0:
+            raise LookupError('pop from empty heap')
+        min_item = self._items[0]
+        self._items[0] = item
+        _shift_down(self._items, 0, self._less)
+        return min_item
+    
+    def nsmallest(self, k):
+        """
+        Return a list of the k items that would be popped first, in order.
+        
+        The heap isn't changed. Explores the heap from the top with a 
+        second heap of candidates: only a popped node's children can be 
+        next, so this takes O(k * log(k)) time, no matter how big the heap 
+        is. For a max-heap these are the k largest items.
+        """
+        items = self._items
+        result = []
+        if k <= 0 or len(items) == 0:
+            return result
+        # candidates are (item, index) tuples
+        candidates = BinaryHeap(max_=self._max)
+        candidates.insert((items[0], 0))
+        while len(result) < k and len(candidates) > 0:
+            item, index = candidates.pop()
+            result.append(item)
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(items):
+                    candidates.insert((items[child], child))
+        return result
+
+
+class DaryHeap:
+    """
+    A d-ary heap implementation (using a list); each node has up to d 
+    children.
+    
+    A d-ary heap is only log(2)/log(d) times as deep as a binary heap, so 
+    insert (which only moves up the heap) gets faster as d grows, while pop 
+    gets slower because it compares each node's d children on the way down. 
+    A 4-ary heap is usually a good compromise for workloads with many 
+    inserts per pop, like Dijkstra's algorithm. Children of a node are also 
+    next to each other in the list, which helps locality.
+    
+    A typical pattern for items is a tuple in the form: 
+    (priority_number, data).
+    """
+    
+    def __init__(self, list_=None, max_=False, arity=4):
+        """
+        Initialize an empty heap.
+        
+        list_ -- a list of initial items; this won't be copied, just wrapped
+                 and heapified; careful: mutating the list outside the heap's 
+                 interface will probably break the heap property
+        max_ -- if True, make a max-heap; min-heap otherwise (default)
+        arity -- the max number of children per node (default: 4)
+        
+        By default the lowest valued items are retrieved first (the lowest 
+        valued item is the one returned by `sorted(list(items))[0]`). Users
+        must set the named parameter `max_=True` if they want a max-heap.
+        """
+        if arity < 2:
+            raise ValueError('arity must be at least 2')
+        self.arity = arity
+        self._max = max_
+        if max_:
+            self._less = operator.gt
+        else:
+            self._less = operator.lt
+        if list_ is not None:
+            self._items = list_
+            heapify(self._items, max_, arity)
+        else:
+            self._items = []
+    
+    def __len__(self):
+        """Return the number of items in the heap as an int."""
+        return len(self._items)
+    
+    def insert(self, item):
+        """
+        Insert a new item.
+        
+        item -- the item to be inserted
+        
+        This operation's time complexity is `O(log(n) / log(d))`, where `n` 
+        is the number of items in the heap and `d` the arity.
+        """
+        self._items.append(item)
+        _dary_shift_up(self._items, len(self._items) - 1, self._less, 
+                       self.arity)
+    
+    def peek(self):
+        """
+        Return the item on top of the heap without removing the item.
+        
+        Raises a `LookupError('peek into empty heap')` if the heap is empty.
+        """
+        if len(self._items) == 0:
+            raise LookupError('peek into empty heap')
+        return self._items[0]
+    
+    def pop(self):
+        """
+        Remove and return the item that's currently on top of the heap. 
+        
+        This operation's time complexity is `O(d * log(n) / log(d))`, where 
+        `n` is the number of items in the heap and `d` the arity.
+        
+        Raises a `LookupError('pop from empty heap')` if the heap is empty.
+        """
+        if len(self._items) == 0:
+            raise LookupError('pop from empty heap')
+        last_item = self._items.pop()
+        if len(self._items) == 0:
+            return last_item
+        # move the last item to the top, then repair the heap property
+        min_item = self._items[0]
+        self._items[0] = last_item
+        _dary_shift_down(self._items, 0, self._less, self.arity)
+        return min_item
+    
+    def extend(self, iterable):
+        """
+        Insert all items from the given iterable.
+        
+        See BinaryHeap.extend.
+        """
+        batch = list(iterable)
+        num_items = len(self._items)
+        self._items.extend(batch)
+        if worth_heapifying(num_items, len(batch)):
+            heapify(self._items, self._max, self.arity)
+        else:
+            for index in range(num_items, len(self._items)):
+                _dary_shift_up(self._items, index, self._less, self.arity)
+    
+    def merge(self, other_heap):
+        """
+        Insert all items of another heap into this one.
+        
+        other_heap -- a heap of the same type and ordering; it's left 
+                      unchanged
+        """
+        self.extend(other_heap._items)
+    
+    def pushpop(self, item):
+        """
+        Insert the item, then remove and return the item on top of the heap.
+        
+        See BinaryHeap.pushpop.
+        """
+        if len(self._items) == 0 or not self._less(self._items[0], item):
+            return item
+        min_item = self._items[0]
+        self._items[0] = item
+        _dary_shift_down(self._items, 0, self._less, self.arity)
+        return min_item
+    
+    def replace(self, item):
+        """
+        Remove and return the item on top of the heap, then insert the item.
+        
+        See BinaryHeap.replace.
+        
+        Raises a `LookupError('pop from empty heap')` if the heap is empty.
+        """
+        if len(self._items) == 0:
+            raise LookupError('pop from empty heap')
+        min_item = self._items[0]
+        self._items[0] = item
+        _dary_shift_down(self._items, 0, self._less, self.arity)
+        return min_item
+    
+    def nsmallest(self, k):
+        """
+        Return a list of the k items that would be popped first, in order.
+        
+        See BinaryHeap.nsmallest.
+        """
+        items = self._items
+        result = []
+        if k <= 0 or len(items) == 0:
+            return result
+        # candidates are (item, index) tuples
+        candidates = DaryHeap(max_=self._max, arity=self.arity)
+        candidates.insert((items[0], 0))
+        while len(result) < k and len(candidates) > 0:
+            item, index = candidates.pop()
+            result.append(item)
+            first = self.arity * index + 1
+            for child in range(first, min(first + self.arity, len(items))):
+                candidates.insert((items[child], child))
+        return result
+
+
+class KeySplitHeap:
+    """
+    A binary heap with numeric priorities kept apart from the items.
+    
+    Priorities are kept in a typed `array.array` (e.g. of doubles or of 
+    64-bit integers) and the items in a parallel list. So, unlike 
+    BinaryHeap with (priority, data) tuples, inserting doesn't allocate a 
+    tuple, and the heap only ever compares primitive priorities (never the 
+    items, even on ties), using the `<` operator directly instead of a 
+    function.
+    
+    For a max-heap we store negated priorities, so the typecode must be a 
+    signed (or floating point) one.
+    """
+    
+    def __init__(self, typecode='d', max_=False):
+        """
+        Initialize an empty heap.
+        
+        typecode -- the `array.array` typecode for the priorities 
+                    (default: 'd', i.e. double precision floats; use 'q' 
+                    for 64-bit integers)
+        max_ -- if True, make a max-heap; min-heap otherwise (default)
+        """
+        self._keys = array.array(typecode)
+        self._items = []
+        self._max = max_
+    
+    def __len__(self):
+        """Return the number of items in the heap as an int."""
+        return len(self._items)
+    
+    def insert(self, priority, item):
+        """
+        Insert a new item with the given priority.
+        
+        priority -- a number that fits the heap's typecode
+        item -- the item to be inserted
+        
+        This operation's time complexity is `O(log(n))`, where `n` is the
+        number of items in the heap.
+        """
+        if self._max:
+            priority = -priority
+        keys, items = self._keys, self._items
+        keys.append(priority)
+        items.append(item)
+        # move parents down until we find the new item's place
+        index = len(items) - 1
+        while index > 0:
+            parent = (index - 1) >> 1
+            parent_key = keys[parent]
+            if not priority < parent_key:
+                break
+            keys[index] = parent_key
+            items[index] = items[parent]
+            index = parent
+        keys[index] = priority
+        items[index] = item
+    
+    def peek(self):
+        """
+        Return the (priority, item) tuple on top of the heap, without 
+        removing it.
+        
+        Raises a `LookupError('peek into empty heap')` if the heap is empty.
+        """
+        if len(self._items) == 0:
+            raise LookupError('peek into empty heap')
+        if self._max:
+            return (-self._keys[0], self._items[0])
+        return (self._keys[0], self._items[0])
+    
+    def pop(self):
+        """
+        Remove and return the (priority, item) tuple on top of the heap.
+        
+        Raises a `LookupError('pop from empty heap')` if the heap is empty.
+        """
+        keys, items = self._keys, self._items
+        if len(items) == 0:
+            raise LookupError('pop from empty heap')
+        top = (-keys[0] if self._max else keys[0], items[0])
+        # take the last entry out, and find its place starting at the top
+        priority = keys.pop()
+        item = items.pop()
+        n = len(items)
+        if n == 0:
+            return top
+        index = 0
+        child = 1
+        while child < n:
+            # get the min child
+            child_key = keys[child]
+            if child + 1 < n and keys[child + 1] < child_key:
+                child += 1
+                child_key = keys[child]
+            if not child_key < priority:
+                break
+            # move the min child up
+            keys[index] = child_key
+            items[index] = items[child]
+            index = child
+            child = 2 * index + 1
+        keys[index] = priority
+        items[index] = item
+        return top
@@ -1,5 +1,8 @@
 """
-A simple binary search tree implementation.
+A simple binary search tree implementation, and a self-balancing (AVL) one.
+
+Also includes a static search tree stored in an array (in Eytzinger 
+order), for lookups in sets that don't change.
 
 Operations:
 - __len__
@@ -7,6 +10,11 @@ Operations:
 - root
 - insert
 - find
+- __iter__, __reversed__, range
+- floor, ceiling, predecessor, successor
+- delete, rank, select, count_range (AVLTree only)
+- from_sorted, union, merge (AVLTree only)
+- bisect, find_many, bisect_many (EytzingerTree only)
 
 Author:
   Chris Nitsas
@@ -21,7 +29,164 @@ Date:
 """
 
 
-__all__ = ['BinarySearchTree', 'BinarySearchTreeUsingNodes', 'Node']
+import array
+try:
+    import numpy
+except ImportError:
+    # numpy is only needed for EytzingerTree's find_many and bisect_many
+    numpy = None
+
+
+__all__ = ['BinarySearchTree', 'BinarySearchTreeUsingNodes', 'Node', 
+           'AVLTree', 'AVLNode', 'EytzingerTree']
+
+
+def _in_order(node, lo=None, hi=None):
+    """
+    Yield the values in the subtree rooted at node in sorted order.
+    
+    lo -- if not None, start from the first value >= lo
+    hi -- if not None, stop before the first value >= hi
+    
+    Uses an explicit stack (so deep trees are fine) that holds at most one 
+    path from the root; getting the first value is O(depth) and each next 
+    one is amortized O(1).
+    """
+    stack = []
+    # push the path to the first value >= lo; we skip nodes < lo, and 
+    # their left subtrees, by going right
+    while node is not None:
+        if lo is None or not node.value < lo:
+            stack.append(node)
+            node = node.left
+        else:
+            node = node.right
+    while len(stack) > 0:
+        node = stack.pop()
+        if hi is not None and not node.value < hi:
+            return
+        yield node.value
+        node = node.right
+        while node is not None:
+            stack.append(node)
+            node = node.left
+
+
+def _reverse_in_order(node):
+    """
+    Yield the values in the subtree rooted at node in reverse sorted order.
+    
+    Uses an explicit stack, like _in_order.
+    """
+    stack = []
+    while len(stack) > 0 or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = node.right
+        node = stack.pop()
+        yield node.value
+        node = node.left
+
+
+def _closest(node, value, below, strict):
+    """
+    Return the value in the subtree closest to the given one, or None.
+    
+    below -- if True look for values <= value, otherwise for values >= value
+    strict -- if True exclude values equal to the given one
+    """
+    result = None
+    while node is not None:
+        if node.value == value:
+            if not strict:
+                return node.value
+            # skip the values equal to the given one
+            node = node.left if below else node.right
+        elif (node.value < value) == below:
+            # a candidate; look for a closer one on the other side
+            result = node.value
+            node = node.right if below else node.left
+        else:
+            node = node.left if below else node.right
+    return result
+
+
+def _merge_sorted(first, second):
+    """
+    Yield the values of two sorted iterables in sorted order; linear time.
+    
+    On ties, values from `first` come first.
+    """
+    first, second = iter(first), iter(second)
+    sentinel = object()
+    a, b = next(first, sentinel), next(second, sentinel)
+    while a is not sentinel and b is not sentinel:
+        if b < a:
+            yield b
+            b = next(second, sentinel)
+        else:
+            yield a
+            a = next(first, sentinel)
+    if a is not sentinel:
+        yield a
+        yield from first
+    if b is not sentinel:
+        yield b
+        yield from second
+
+
+class _OrderedQueries:
+    """
+    Iteration and floor/ceiling queries, for trees that keep their root 
+    node in `self._root`.
+    """
+    
+    def __iter__(self):
+        """
+        Yield the values in sorted order, lazily.
+        """
+        return _in_order(self._root)
+    
+    def __reversed__(self):
+        """
+        Yield the values in reverse sorted order, lazily.
+        """
+        return _reverse_in_order(self._root)
+    
+    def range(self, lo=None, hi=None):
+        """
+        Yield the values v with lo <= v < hi in sorted order, lazily.
+        
+        lo -- the lower bound; None for no lower bound
+        hi -- the upper bound; None for no upper bound
+        
+        For a balanced tree this is O(log(n) + k) for k values.
+        """
+        return _in_order(self._root, lo, hi)
+    
+    def floor(self, value):
+        """
+        Return the biggest value in the tree <= value; None if there's none.
+        """
+        return _closest(self._root, value, below=True, strict=False)
+    
+    def ceiling(self, value):
+        """
+        Return the smallest value in the tree >= value; None if there's none.
+        """
+        return _closest(self._root, value, below=False, strict=False)
+    
+    def predecessor(self, value):
+        """
+        Return the biggest value in the tree < value; None if there's none.
+        """
+        return _closest(self._root, value, below=True, strict=True)
+    
+    def successor(self, value):
+        """
+        Return the smallest value in the tree > value; None if there's none.
+        """
+        return _closest(self._root, value, below=False, strict=True)
 
 
 class Node:
@@ -37,7 +202,7 @@ class Node:
         self.value = value
 
 
-class BinarySearchTreeUsingNodes:
+class BinarySearchTreeUsingNodes(_OrderedQueries):
     """
     A simple binary tree implemented using a Node class.
     
@@ -139,8 +304,464 @@ class BinarySearchTreeUsingNodes:
         return None
 
 
-BinarySearchTree = BinarySearchTreeUsingNodes
+class AVLNode:
+    """
+    A node in an AVL tree.
+    
+    Like Node, but it also knows the `height` and the `size` (number of 
+    nodes) of the subtree rooted at it; a leaf has height 1 and size 1. 
+    Uses __slots__ to save memory.
+    """
+    
+    __slots__ = ('value', 'left', 'right', 'height', 'size')
+    
+    def __init__(self, value):
+        self.left = None
+        self.right = None
+        self.value = value
+        self.height = 1
+        self.size = 1
+
+
+def _height(node):
+    return 0 if node is None else node.height
+
+
+def _size(node):
+    return 0 if node is None else node.size
+
+
+def _update(node):
+    """Recompute the node's height and size from its children's."""
+    node.height = 1 + max(_height(node.left), _height(node.right))
+    node.size = 1 + _size(node.left) + _size(node.right)
+
+
+def _rotate_right(node):
+    """Rotate the subtree right; return its new root (the left child)."""
+    pivot = node.left
+    node.left = pivot.right
+    pivot.right = node
+    _update(node)
+    _update(pivot)
+    return pivot
+
 
+def _rotate_left(node):
+    """Rotate the subtree left; return its new root (the right child)."""
+    pivot = node.right
+    node.right = pivot.left
+    pivot.left = node
+    _update(node)
+    _update(pivot)
+    return pivot
 
-# NOTE: I should also try to implement one using a list, for better locality
-#   of reference.
+
+def _rebalance(node):
+    """
+    Update the node and, if its children's heights differ by more than one, 
+    rotate it; return the (possibly new) root of the subtree.
+    """
+    _update(node)
+    balance = _height(node.left) - _height(node.right)
+    if balance > 1:
+        if _height(node.left.left) < _height(node.left.right):
+            node.left = _rotate_left(node.left)
+        return _rotate_right(node)
+    elif balance < -1:
+        if _height(node.right.right) < _height(node.right.left):
+            node.right = _rotate_right(node.right)
+        return _rotate_left(node)
+    return node
+
+
+class AVLTree(_OrderedQueries):
+    """
+    A self-balancing binary search tree (AVL tree).
+    
+    Same interface as BinarySearchTreeUsingNodes, plus `delete`, but the 
+    heights of every node's two subtrees differ by at most one, so the 
+    tree's height is at most about 1.44 * log2(n) no matter the order of 
+    insertions. Hence insert, delete and find are all O(log(n)).
+    
+    Like BinarySearchTreeUsingNodes, the tree can hold equal values (each 
+    insert adds a node).
+    
+    Every node also knows the size of its subtree, which lets us answer 
+    order-statistic queries (rank, select, count_range) in O(log(n)) too.
+    """
+    
+    def __init__(self, sequence=None, no_shuffle=False):
+        """
+        Initialize the tree.
+        
+        sequence -- a sequence of values to put in the tree initially
+        no_shuffle -- ignored; the tree stays balanced anyway (accepted for 
+                      compatibility with BinarySearchTreeUsingNodes)
+        """
+        self._root = None
+        self._len = 0
+        if sequence is not None:
+            self.extend(sequence)
+    
+    def __len__(self):
+        return self._len
+    
+    def __contains__(self, value):
+        return self.find(value) is not None
+    
+    @classmethod
+    def from_sorted(cls, sequence):
+        """
+        Return a perfectly balanced tree with the given values; O(n).
+        
+        sequence -- an iterable of values in sorted order
+        
+        The middle value goes to the root, the lower half to the left 
+        subtree and the higher half to the right one, recursively (but 
+        implemented iteratively). A subtree with s nodes then has height 
+        s.bit_length(), which we set directly.
+        
+        Raises ValueError if the values are not sorted.
+        """
+        values = list(sequence)
+        for index in range(1, len(values)):
+            if values[index] < values[index - 1]:
+                raise ValueError('values must be sorted')
+        tree = cls()
+        tree._len = len(values)
+        # each entry: (begin, end, parent node, is left child)
+        stack = [(0, len(values), None, True)]
+        while len(stack) > 0:
+            begin, end, parent, is_left = stack.pop()
+            if begin == end:
+                continue
+            middle = (begin + end) // 2
+            node = AVLNode(values[middle])
+            node.size = end - begin
+            node.height = node.size.bit_length()
+            if parent is None:
+                tree._root = node
+            elif is_left:
+                parent.left = node
+            else:
+                parent.right = node
+            stack.append((begin, middle, node, True))
+            stack.append((middle + 1, end, node, False))
+        return tree
+    
+    def union(self, other):
+        """
+        Return a new (balanced) tree with the values of both trees; O(n + m).
+        
+        other -- a tree that can be iterated in sorted order
+        
+        Equal values are all kept, i.e. len(result) == len(self) + 
+        len(other). Both trees are left unchanged.
+        """
+        return type(self).from_sorted(_merge_sorted(self, other))
+    
+    def merge(self, other):
+        """
+        Insert all values of another tree into this one; O(n + m).
+        
+        other -- a tree that can be iterated in sorted order; it's left 
+                 unchanged
+        
+        The tree is rebuilt from both trees' sorted values, so this beats 
+        inserting the other tree's values one by one unless the other tree 
+        is much smaller.
+        """
+        merged = self.union(other)
+        self._root, self._len = merged._root, merged._len
+    
+    def root(self):
+        return self._root
+    
+    def height(self):
+        """
+        Return the height of the tree (0 for an empty tree).
+        """
+        return _height(self._root)
+    
+    def _fix_path(self, path):
+        """
+        Rebalance the nodes on a root-to-node path, bottom up.
+        
+        path -- a list of nodes, each one a child of the previous one, 
+                starting from the root
+        """
+        for index in reversed(range(len(path))):
+            node = path[index]
+            new_node = _rebalance(node)
+            if new_node is not node:
+                if index == 0:
+                    self._root = new_node
+                elif path[index - 1].left is node:
+                    path[index - 1].left = new_node
+                else:
+                    path[index - 1].right = new_node
+    
+    def insert(self, value):
+        """
+        Insert the given value in the tree; O(log(n)).
+        
+        Iterative implementation to avoid hitting the maximum recursion depth.
+        """
+        path = []
+        node = self._root
+        while node is not None:
+            path.append(node)
+            if value <= node.value:
+                node = node.left
+            else:
+                node = node.right
+        if len(path) == 0:
+            self._root = AVLNode(value)
+        elif value <= path[-1].value:
+            path[-1].left = AVLNode(value)
+        else:
+            path[-1].right = AVLNode(value)
+        self._len += 1
+        self._fix_path(path)
+    
+    def extend(self, sequence, no_shuffle=False):
+        """
+        Add all values from the given sequence.
+        
+        sequence -- a sequence of values
+        no_shuffle -- ignored; see __init__
+        """
+        for value in sequence:
+            self.insert(value)
+    
+    def find(self, value):
+        """
+        Find a node with the given value (the shallowest one), if one exists.
+        
+        Iterative implementation to avoid hitting the maximum recursion depth.
+        """
+        node = self._root
+        while node is not None:
+            if value == node.value:
+                return node
+            elif value < node.value:
+                node = node.left
+            else:
+                node = node.right
+        return None
+    
+    def rank(self, value):
+        """
+        Return the number of values in the tree that are smaller than the 
+        given one; O(log(n)).
+        
+        This is also the index where value would be inserted in the sorted 
+        values (like binary_search.bisect).
+        """
+        result = 0
+        node = self._root
+        while node is not None:
+            if node.value < value:
+                result += _size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+        return result
+    
+    def select(self, k):
+        """
+        Return the k-th smallest value in the tree, counting from 0; 
+        O(log(n)).
+        
+        Raises IndexError if k is out of range.
+        """
+        if not 0 <= k < self._len:
+            raise IndexError('tree index out of range')
+        node = self._root
+        while True:
+            left_size = _size(node.left)
+            if k < left_size:
+                node = node.left
+            elif k == left_size:
+                return node.value
+            else:
+                k -= left_size + 1
+                node = node.right
+    
+    def count_range(self, lo, hi):
+        """
+        Return the number of values v in the tree with lo <= v < hi; 
+        O(log(n)).
+        """
+        return max(0, self.rank(hi) - self.rank(lo))
+    
+    def delete(self, value):
+        """
+        Remove one occurrence of the given value from the tree; O(log(n)).
+        
+        Raises KeyError if the value is not in the tree.
+        """
+        path = []
+        node = self._root
+        while node is not None and value != node.value:
+            path.append(node)
+            if value < node.value:
+                node = node.left
+            else:
+                node = node.right
+        if node is None:
+            raise KeyError(value)
+        if node.left is not None and node.right is not None:
+            # replace the value with its successor's, then remove the 
+            # successor's node instead (it has no left child)
+            path.append(node)
+            successor = node.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+            node.value = successor.value
+            node = successor
+        child = node.left if node.left is not None else node.right
+        if len(path) == 0:
+            self._root = child
+        elif path[-1].left is node:
+            path[-1].left = child
+        else:
+            path[-1].right = child
+        self._len -= 1
+        self._fix_path(path)
+
+
+BinarySearchTree = AVLTree
+
+
+class EytzingerTree:
+    """
+    A static search tree stored in an array, in Eytzinger (BFS) order.
+    
+    The values are laid out like in a binary heap: the root is at index 1 
+    and the children of index k are at 2*k and 2*k + 1, and an in-order 
+    traversal gives the values sorted. So there are no pointers at all, the 
+    first levels of the tree (the ones every search goes through) are next 
+    to each other in memory, and the values live in a typed `array`.
+    
+    A search always goes down to a leaf, choosing the child with 
+    `k = 2*k + (values[k] < x)`, i.e. without any branching on the 
+    comparison. That's also what makes it easy to run many searches at once 
+    with numpy (see find_many and bisect_many).
+    
+    The tree can't be changed after it's built.
+    """
+    
+    def __init__(self, sequence, typecode='d'):
+        """
+        Build the tree.
+        
+        sequence -- the values; they don't have to be sorted (but sorting 
+                    an already sorted sequence takes linear time)
+        typecode -- an `array` typecode that fits all values, e.g. 'd' for 
+                    floats (default) or 'q' for 64-bit integers
+        
+        Complexity is O(n) for sorted sequences, O(n * log(n)) otherwise.
+        """
+        sorted_values = sorted(sequence)
+        n = len(sorted_values)
+        self._len = n
+        # index 0 is unused, so that the children of k are 2*k and 2*k + 1
+        self._values = array.array(typecode, [0]) * (n + 1)
+        # self._ranks[k] is the index of self._values[k] in sorted order
+        self._ranks = array.array('q', [n]) * (n + 1)
+        # fill the tree with an (iterative) in-order traversal
+        stack = []
+        k = 1
+        rank = 0
+        while len(stack) > 0 or k <= n:
+            while k <= n:
+                stack.append(k)
+                k = 2 * k
+            k = stack.pop()
+            self._values[k] = sorted_values[rank]
+            self._ranks[k] = rank
+            rank += 1
+            k = 2 * k + 1
+    
+    def __len__(self):
+        return self._len
+    
+    def __contains__(self, value):
+        return self.find(value) is not None
+    
+    def _lower_bound(self, value):
+        """
+        Return the tree index of the first value >= the given one; 0 if 
+        there is no such value.
+        """
+        values = self._values
+        n = self._len
+        k = 1
+        while k <= n:
+            k = 2 * k + (values[k] < value)
+        # we went right after the last node that was >= value and left 
+        # ever since; so cancel those right steps plus one left step
+        return k >> (~k & (k + 1)).bit_length()
+    
+    def bisect(self, value):
+        """
+        Return the number of values smaller than the given one.
+        
+        Like binary_search.bisect, this is the index where value would be 
+        inserted to keep the (sorted) values sorted.
+        """
+        return self._ranks[self._lower_bound(value)]
+    
+    def find(self, value):
+        """
+        Return the index (in sorted order) of the first occurrence of the 
+        given value; None if it's not in the tree.
+        """
+        k = self._lower_bound(value)
+        if k == 0 or self._values[k] != value:
+            return None
+        return self._ranks[k]
+    
+    def _lower_bounds(self, values):
+        """
+        Vectorized _lower_bound; return (tree indices, values as an array).
+        """
+        if numpy is None:
+            raise ImportError('find_many and bisect_many need numpy')
+        tree = numpy.frombuffer(self._values, dtype=self._values.typecode)
+        values = numpy.asarray(values)
+        n = self._len
+        k = numpy.ones(values.shape, dtype=numpy.int64)
+        for _ in range(n.bit_length()):
+            # searches that already reached a leaf stay where they are
+            active = k <= n
+            k = numpy.where(active, 
+                            2 * k + (tree[numpy.minimum(k, n)] < values), k)
+        # k >> (number of trailing ones + 1)
+        k //= 2 * (~k & (k + 1))
+        return k, values
+    
+    def bisect_many(self, values):
+        """
+        Return a numpy array with bisect(value) for every value in values.
+        
+        values -- a numpy array (or anything numpy.asarray accepts)
+        """
+        k, _ = self._lower_bounds(values)
+        return numpy.frombuffer(self._ranks, dtype=numpy.int64)[k]
+    
+    def find_many(self, values):
+        """
+        Return a numpy array with find(value) for every value in values, but 
+        with -1 instead of None for values not in the tree.
+        
+        values -- a numpy array (or anything numpy.asarray accepts)
+        """
+        k, values = self._lower_bounds(values)
+        tree = numpy.frombuffer(self._values, dtype=self._values.typecode)
+        ranks = numpy.frombuffer(self._ranks, dtype=numpy.int64)[k]
+        found = (k > 0) & (tree[k] == values)
+        return numpy.where(found, ranks, -1)
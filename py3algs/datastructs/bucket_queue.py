@@ -0,0 +1,135 @@
+"""
+A bucket queue (Dial's algorithm's priority queue) for small non-negative 
+integer priorities.
+
+Keeps a circular array of C+1 buckets (lists), one for each priority in the 
+range [last popped priority, last popped priority + C], where C is the max
+difference between an inserted priority and the last popped priority (e.g.
+the max edge weight, in Dijkstra's algorithm).
+
+Only works as a monotone min-queue: popped priorities never decrease, i.e. 
+one can't insert an item with lower priority than the last popped one.
+
+Operations:  
+- __len__
+- insert 
+- pop
+- peek
+
+Complexity:
+- insert is O(1)
+- pop is O(1) amortized over a run of Dijkstra's algorithm; a single pop 
+  may scan up to C empty buckets
+
+Author:  
+  Christos Nitsas  
+  (nitsas)  
+  (chrisnitsas)
+
+Language:
+  Python 3(.4)
+
+Date:
+  October, 2026
+"""
+
+
+__all__ = ['BucketQueue']
+
+
+class BucketQueue:
+    """
+    A monotone bucket queue for small non-negative integer priorities.
+    
+    Items must be tuples in the form: (priority, data), where priority is a 
+    non-negative integer. This matches the heaps in binary_heap, so a 
+    BucketQueue (e.g. `functools.partial(BucketQueue, max_weight)`) can be 
+    used as dijkstra_sssp's heap_type.
+    
+    Items with equal priority come out in insertion order.
+    """
+    
+    def __init__(self, max_weight):
+        """
+        Initialize an empty queue.
+        
+        max_weight -- a non-negative integer; inserted priorities must be in 
+                      the range [last, last + max_weight], where last is the 
+                      last popped priority (0 before the first pop)
+        """
+        if max_weight < 0:
+            raise ValueError('max_weight must be non-negative')
+        self.max_weight = max_weight
+        self._buckets = [[] for _ in range(max_weight + 1)]
+        # the last popped (or peeked) priority; no smaller priorities can be 
+        # inserted
+        self._last = 0
+        # the index of the first item not yet popped in the current bucket 
+        # (we don't pop from the front of lists, it's slow)
+        self._head = 0
+        self._len = 0
+    
+    def __len__(self):
+        """Return the number of items in the queue as an int."""
+        return self._len
+    
+    def insert(self, item):
+        """
+        Insert a new item.
+        
+        item -- a (priority, data) tuple
+        
+        This operation's time complexity is `O(1)`.
+        
+        Raises a ValueError if the priority is outside the range 
+        [last, last + max_weight], where last is the last popped (or 
+        peeked) priority.
+        """
+        priority = item[0]
+        if not self._last <= priority <= self._last + self.max_weight:
+            raise ValueError('priority must be in the range [last popped, '
+                             'last popped + max_weight]')
+        self._buckets[priority % len(self._buckets)].append(item)
+        self._len += 1
+    
+    def _advance(self):
+        """
+        Move to the first non-empty bucket, starting at the current one, 
+        and return it. The queue must not be empty.
+        
+        This advances `self._last` to the lowest priority in the queue.
+        """
+        buckets = self._buckets
+        bucket = buckets[self._last % len(buckets)]
+        while self._head == len(bucket):
+            # current bucket exhausted; clear it and move on
+            bucket.clear()
+            self._head = 0
+            self._last += 1
+            bucket = buckets[self._last % len(buckets)]
+        return bucket
+    
+    def peek(self):
+        """
+        Return the item with the lowest priority without removing it.
+        
+        Raises a `LookupError('peek into empty heap')` if the queue is 
+        empty.
+        """
+        if self._len == 0:
+            raise LookupError('peek into empty heap')
+        return self._advance()[self._head]
+    
+    def pop(self):
+        """
+        Remove and return the item with the lowest priority.
+        
+        Raises a `LookupError('pop from empty heap')` if the queue is empty.
+        """
+        if self._len == 0:
+            raise LookupError('pop from empty heap')
+        bucket = self._advance()
+        item = bucket[self._head]
+        self._head += 1
+        self._len -= 1
+        return item
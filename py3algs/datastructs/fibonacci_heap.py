@@ -0,0 +1,289 @@
+"""
+A Fibonacci heap implementation (using nodes).
+
+A Fibonacci heap is a collection of heap-ordered trees whose roots are kept 
+in a circular doubly linked list. Inserting and melding just add trees to 
+the root list; the work is postponed until a pop, which links trees of 
+equal degree until all roots have distinct degrees. decrease_key cuts the 
+node off its parent, and cascades the cut up through ancestors that have 
+already lost a child ("marked" nodes), which keeps the trees bushy.
+
+Operations:  
+- __len__
+- insert 
+- pop
+- peek
+- decrease_key
+- meld
+
+Complexity (amortized):
+- insert, peek, decrease_key and meld are O(1)
+- pop is O(log(n))
+
+Author:  
+  Christos Nitsas  
+  (nitsas)  
+  (chrisnitsas)
+
+Language:
+  Python 3(.4)
+
+Date:
+  October, 2026
+"""
+
+
+import operator
+
+
+__all__ = ['FibonacciHeap', 'Node']
+
+
+class Node:
+    """
+    A node in the Fibonacci heap; insert returns it as a handle to the item.
+    
+    A node has an `item`, points to its `parent`, to one of its children 
+    (`child`) and to its `left` and `right` siblings in a circular doubly 
+    linked list. It also knows its `degree` (number of children) and 
+    whether it's `marked`, i.e. has lost a child since it became a child 
+    itself.
+    """
+    
+    __slots__ = ('item', 'parent', 'child', 'left', 'right', 'degree', 
+                 'marked')
+    
+    def __init__(self, item):
+        self.item = item
+        self.parent = None
+        self.child = None
+        self.left = self
+        self.right = self
+        self.degree = 0
+        self.marked = False
+
+
+def _splice(a, b):
+    """
+    Concatenate two circular doubly linked lists, given a node of each.
+    """
+    a_right, b_left = a.right, b.left
+    a.right, b.left = b, a
+    b_left.right, a_right.left = a_right, b_left
+
+
+def _remove(node):
+    """
+    Remove a node from its circular doubly linked list.
+    
+    The node becomes a list of its own.
+    """
+    node.left.right = node.right
+    node.right.left = node.left
+    node.left = node.right = node
+
+
+class FibonacciHeap:
+    """
+    A Fibonacci heap implementation (using nodes).
+    
+    Has the same interface as binary_heap.BinaryHeap, plus decrease_key and 
+    meld. insert returns a handle (a Node) that can later be passed to 
+    decrease_key.
+    
+    A typical pattern for items is a tuple in the form: 
+    (priority_number, data).
+    """
+    
+    def __init__(self, max_=False):
+        """
+        Initialize an empty heap.
+        
+        max_ -- if True, make a max-heap; min-heap otherwise (default)
+        """
+        self._max = max_
+        if max_:
+            self._less = operator.gt
+        else:
+            self._less = operator.lt
+        # the root with the "lowest" item; the root list is reached from it
+        self._top = None
+        self._len = 0
+    
+    def __len__(self):
+        """Return the number of items in the heap as an int."""
+        return self._len
+    
+    def _add_root(self, node):
+        """Add a node (with its subtree) to the root list."""
+        node.parent = None
+        node.marked = False
+        if self._top is None:
+            self._top = node
+        else:
+            _splice(self._top, node)
+            if self._less(node.item, self._top.item):
+                self._top = node
+    
+    def insert(self, item):
+        """
+        Insert a new item and return its handle (a Node).
+        
+        item -- the item to be inserted
+        
+        This operation's time complexity is `O(1)`.
+        """
+        node = Node(item)
+        self._add_root(node)
+        self._len += 1
+        return node
+    
+    def peek(self):
+        """
+        Return the item on top of the heap without removing the item.
+        
+        Raises a `LookupError('peek into empty heap')` if the heap is empty.
+        """
+        if self._top is None:
+            raise LookupError('peek into empty heap')
+        return self._top.item
+    
+    def _consolidate(self):
+        """
+        Link roots of equal degree until all roots have distinct degrees, 
+        and find the new top.
+        """
+        # collect the roots first, since linking changes the root list
+        roots = [self._top]
+        node = self._top.right
+        while node is not self._top:
+            roots.append(node)
+            node = node.right
+        less = self._less
+        # root of each degree found so far
+        by_degree = []
+        for node in roots:
+            _remove(node)
+            degree = node.degree
+            while degree < len(by_degree) and by_degree[degree] is not None:
+                other = by_degree[degree]
+                by_degree[degree] = None
+                if less(other.item, node.item):
+                    node, other = other, node
+                # make other a child of node
+                other.parent = node
+                other.marked = False
+                if node.child is None:
+                    node.child = other
+                else:
+                    _splice(node.child, other)
+                node.degree += 1
+                degree += 1
+            while degree >= len(by_degree):
+                by_degree.append(None)
+            by_degree[degree] = node
+        self._top = None
+        for node in by_degree:
+            if node is not None:
+                self._add_root(node)
+    
+    def pop(self):
+        """
+        Remove and return the item that's currently on top of the heap.
+        
+        This operation's amortized time complexity is `O(log(n))`.
+        
+        Raises a `LookupError('pop from empty heap')` if the heap is empty.
+        """
+        top = self._top
+        if top is None:
+            raise LookupError('pop from empty heap')
+        # move the top's children to the root list
+        if top.child is not None:
+            child = top.child
+            while True:
+                child.parent = None
+                child = child.right
+                if child is top.child:
+                    break
+            _splice(top, top.child)
+            top.child = None
+        if top.right is top:
+            self._top = None
+        else:
+            self._top = top.right
+            _remove(top)
+            self._consolidate()
+        self._len -= 1
+        return top.item
+    
+    def _cut(self, node):
+        """Move a (non-root) node, with its subtree, to the root list."""
+        parent = node.parent
+        if parent.child is node:
+            if node.right is node:
+                parent.child = None
+            else:
+                parent.child = node.right
+        _remove(node)
+        parent.degree -= 1
+        self._add_root(node)
+    
+    def decrease_key(self, node, item):
+        """
+        Replace a node's item with a "lower" one (higher for a max-heap).
+        
+        node -- a handle returned by insert; its item must still be in the 
+                heap
+        item -- the new item; must not be "greater" than the node's item
+        
+        If the node now violates the heap order, cut it off its parent, and 
+        keep cutting marked ancestors (iteratively).
+        
+        Raises a ValueError if the new item is "greater" than the old one.
+        """
+        if self._less(node.item, item):
+            raise ValueError('new item is greater than the current item')
+        node.item = item
+        parent = node.parent
+        if parent is None:
+            # a root; it may be the new top
+            if self._less(item, self._top.item):
+                self._top = node
+            return
+        if not self._less(item, parent.item):
+            # still heap ordered
+            return
+        # cut the node (this also updates the top if needed), then cut 
+        # marked ancestors until we reach an unmarked one (which we mark) 
+        # or a root
+        self._cut(node)
+        node = parent
+        parent = node.parent
+        while parent is not None:
+            if not node.marked:
+                node.marked = True
+                break
+            self._cut(node)
+            node = parent
+            parent = node.parent
+    
+    def meld(self, other_heap):
+        """
+        Move all items of another Fibonacci heap into this one, in O(1) time.
+        
+        other_heap -- a FibonacciHeap with the same ordering; it will be 
+                      empty afterwards (its handles are valid in this heap)
+        """
+        if other_heap._max != self._max:
+            raise ValueError('cannot meld a min-heap with a max-heap')
+        if other_heap._top is not None:
+            if self._top is None:
+                self._top = other_heap._top
+            else:
+                _splice(self._top, other_heap._top)
+                if self._less(other_heap._top.item, self._top.item):
+                    self._top = other_heap._top
+        self._len += other_heap._len
+        other_heap._top = None
+        other_heap._len = 0
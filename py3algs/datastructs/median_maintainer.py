@@ -1,10 +1,23 @@
 """
 Maintain the median of a stream of items online (i.e. in real-time).
 
+Also includes:
+- a variant that maintains the median of the last N items of the stream (a 
+  sliding window), i.e. one that supports deletions
+- a generalization that maintains an arbitrary quantile (e.g. the 90th 
+  percentile) instead of the median
+- a structure that can answer any quantile (or rank) at any point
+
 Operations:  
 - __len__
 - insert 
-- median
+- extend (MedianMaintainer only)
+- median (quantile for the quantile maintainers)
+- merge
+- to_bytes / from_bytes
+
+All structures except the sliding window one can be merged (e.g. ones 
+built by different processes) and serialized to a compact binary form.
 
 Author:  
   Christos Nitsas  
@@ -20,11 +33,21 @@ Date:
 
 
 import sys
+import collections
+import fractions
+try:
+    import numpy
+except ImportError:
+    # numpy is only needed for the fast path of MedianMaintainer.extend
+    numpy = None
 # modules I've implemented
 from . import binary_heap
+from . import binary_search_tree
+from . import serialization
 
 
-__all__ = ['MedianMaintainer', 'EvenChoice']
+__all__ = ['MedianMaintainer', 'WindowedMedianMaintainer', 
+           'QuantileMaintainer', 'MultiQuantileMaintainer', 'EvenChoice']
 
 
 if sys.version_info[:2] >= (3, 4):
@@ -44,6 +67,52 @@ else:
         Average = 4
 
 
+def _uncross(lower_half, higher_half):
+    """
+    Swap the heaps' top items until the max heap's top is not bigger than 
+    the min heap's top, i.e. every item in lower_half is <= every item in 
+    higher_half.
+    
+    Used after melding two pairs of heaps; each swap is O(log(n)).
+    """
+    while len(lower_half) > 0 and len(higher_half) > 0 and \
+          lower_half.peek() > higher_half.peek():
+        higher_half.replace(lower_half.replace(higher_half.peek()))
+
+
+def _split_halves(*parts):
+    """
+    Split the items of the given lists in a lower and a higher half.
+    
+    Return two lists; the first has the ceil(n/2) smallest items in 
+    descending order, the second the rest in ascending order, where n is 
+    the total number of items. So the first is already a valid max heap and 
+    the second a valid min heap.
+    
+    Sorts with numpy if the last part is a numeric numpy array, and with 
+    list.sort otherwise. (Sorting in C turned out faster than partitioning 
+    and then heapifying each half in Python.)
+    """
+    batch = parts[-1]
+    if numpy is not None and isinstance(batch, numpy.ndarray) and \
+       batch.dtype.kind in 'biuf':
+        items = numpy.concatenate([numpy.asarray(part) for part in parts])
+        if items.ndim == 1 and items.dtype.kind in 'biuf':
+            half = (len(items) + 1) // 2
+            items = numpy.sort(items)
+            return items[half - 1::-1].tolist(), items[half:].tolist()
+        batch = batch.tolist()
+    items = []
+    for part in parts[:-1]:
+        items.extend(part)
+    items.extend(batch)
+    items.sort()
+    half = (len(items) + 1) // 2
+    lower = items[:half]
+    lower.reverse()
+    return lower, items[half:]
+
+
 class MedianMaintainer:
     """
     Maintain the median of a stream of items online (i.e. in real-time).
@@ -165,3 +234,512 @@ class MedianMaintainer:
                 # if_even == EvenChoice.Lower or unknown option
                 # return the N/2th item (default)
                 return self.lower_half.peek()
+    
+    def extend(self, iterable):
+        """
+        Insert all items from the given iterable.
+        
+        iterable -- an iterable of items, or a numpy array of numbers
+        
+        If the batch is big compared to the structure (see 
+        binary_heap.worth_heapifying), we sort all items at once (with 
+        numpy for numeric numpy arrays) and split them in two halves, which 
+        are valid heaps as they are. Otherwise we split the batch 
+        around the current median, extend each heap with its part, and 
+        rebalance the heaps once at the end.
+        """
+        if numpy is not None and isinstance(iterable, numpy.ndarray):
+            batch = iterable.ravel()
+        else:
+            batch = list(iterable)
+        if len(batch) == 0:
+            return
+        if binary_heap.worth_heapifying(len(self), len(batch)):
+            lower, higher = _split_halves(self.lower_half._items, 
+                                          self.higher_half._items, batch)
+            self.lower_half._items = lower
+            self.higher_half._items = higher
+            return
+        if not isinstance(batch, list):
+            batch = batch.tolist()
+        if len(self) == 0:
+            # no median to split around yet; start with the first item
+            self.insert(batch[0])
+            batch = batch[1:]
+        # any pivot between the two heaps' tops works
+        median = self.median()
+        self.lower_half.extend(item for item in batch if item <= median)
+        self.higher_half.extend(item for item in batch if item > median)
+        while len(self.lower_half) > len(self.higher_half) + 1:
+            self.higher_half.insert(self.lower_half.pop())
+        while len(self.higher_half) > len(self.lower_half) + 1:
+            self.lower_half.insert(self.higher_half.pop())
+    
+    def merge(self, other):
+        """
+        Insert all items of another MedianMaintainer into this one.
+        
+        other -- a MedianMaintainer; it's left unchanged
+        
+        We meld the lower halves together and the higher halves together 
+        (in linear time), then swap the heaps' top items while the lower 
+        half's top is bigger than the higher half's, and finally move items 
+        from the bigger half to the smaller. Complexity is O(n + m + 
+        d * log(n + m)), where d is the number of items that end up moving; 
+        it's small when both structures saw similarly distributed items.
+        """
+        self.lower_half.merge(other.lower_half)
+        self.higher_half.merge(other.higher_half)
+        _uncross(self.lower_half, self.higher_half)
+        while len(self.lower_half) > len(self.higher_half) + 1:
+            self.higher_half.insert(self.lower_half.pop())
+        while len(self.higher_half) > len(self.lower_half) + 1:
+            self.lower_half.insert(self.higher_half.pop())
+    
+    def to_bytes(self, typecode='d'):
+        """
+        Return a compact binary form of the structure.
+        
+        typecode -- an `array` typecode that fits all items, e.g. 'd' for 
+                    floats (default) or 'q' for 64-bit integers
+        
+        The heaps are stored as they are, so from_bytes doesn't have to 
+        rebuild them.
+        """
+        return serialization.pack(
+            b'MEDM', typecode, [], 
+            [self.lower_half._items, self.higher_half._items])
+    
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Return a new MedianMaintainer from what to_bytes returned.
+        """
+        _, _, (lower_items, higher_items) = \
+            serialization.unpack(data, b'MEDM')
+        result = cls()
+        result.lower_half._items = lower_items
+        result.higher_half._items = higher_items
+        return result
+
+
+class WindowedMedianMaintainer:
+    """
+    Maintain the median of the last N items of a stream (a sliding window).
+    
+    The user can insert arbitrary items that can be compared to each other 
+    (and hashed), and after each insertion retrieve the median of the last 
+    `window_size` items inserted. The oldest item expires automatically 
+    when the window is full.
+    
+    Complexity:
+    - each insertion (including the expiry) is amortized O(log(N)), where 
+      N is the window size
+    - retrieving the median is amortized O(1)
+    - memory is O(N)
+    
+    Like MedianMaintainer this uses two binary heaps, a max heap for the 
+    lower half of the window and a min heap for the higher half. Expired 
+    items are deleted lazily: we only count them as pending deletions (per 
+    heap) and actually remove them when they reach the top of their heap. 
+    We keep track of the number of live items in each heap, and keep the 
+    lower half equal to or one bigger than the higher half. When expired 
+    items make up over half of the heaps' entries, we rebuild the heaps 
+    from the window, so that memory stays O(N).
+    """
+    
+    def __init__(self, window_size):
+        """
+        Initialize an empty structure.
+        
+        window_size -- a positive integer; the number of latest items we 
+                       compute the median of
+        """
+        if window_size < 1:
+            raise ValueError('window_size must be positive')
+        self.window_size = window_size
+        # the live items, oldest first
+        self._window = collections.deque()
+        self._rebuild()
+    
+    def __len__(self):
+        """
+        Return the number of items in the window.
+        """
+        return len(self._window)
+    
+    def _rebuild(self):
+        """
+        Rebuild the heaps from the items in the window, forgetting all 
+        pending deletions.
+        """
+        items = sorted(self._window)
+        half = (len(items) + 1) // 2
+        # BinaryHeap heapifies the given lists in linear time
+        self.lower_half = binary_heap.BinaryHeap(items[:half], max_=True)
+        self.higher_half = binary_heap.BinaryHeap(items[half:])
+        self._lower_len = half
+        self._higher_len = len(items) - half
+        # item -> number of pending deletions, for each heap
+        self._lower_pending = collections.Counter()
+        self._higher_pending = collections.Counter()
+    
+    @staticmethod
+    def _prune(heap, pending):
+        """
+        Pop items pending deletion off the top of the heap.
+        """
+        while len(heap) > 0 and pending[heap.peek()] > 0:
+            pending[heap.pop()] -= 1
+    
+    def _balance(self):
+        """
+        Make the lower half equal to or one bigger than the higher half.
+        
+        Both heaps' tops must be live items; they still are afterwards.
+        """
+        if self._lower_len > self._higher_len + 1:
+            self.higher_half.insert(self.lower_half.pop())
+            self._lower_len -= 1
+            self._higher_len += 1
+            self._prune(self.lower_half, self._lower_pending)
+        elif self._lower_len < self._higher_len:
+            self.lower_half.insert(self.higher_half.pop())
+            self._higher_len -= 1
+            self._lower_len += 1
+            self._prune(self.higher_half, self._higher_pending)
+    
+    def _remove(self, item):
+        """
+        Remove (lazily) an item that's in one of the heaps.
+        """
+        if item <= self.lower_half.peek():
+            # the item must be in the lower half: everything in the higher 
+            # half is at least as big as the lower half's top
+            self._lower_pending[item] += 1
+            self._lower_len -= 1
+            self._prune(self.lower_half, self._lower_pending)
+        else:
+            self._higher_pending[item] += 1
+            self._higher_len -= 1
+            self._prune(self.higher_half, self._higher_pending)
+        self._balance()
+    
+    def insert(self, item):
+        """
+        Insert item in the structure; expire the oldest item if the window 
+        was full.
+        
+        item -- an item; we assume it can be hashed and compared with all 
+                other items in the structure
+        
+        Complexity is amortized O(log(N)), where N is the window size.
+        """
+        if len(self._lower_pending) > 0 or len(self._higher_pending) > 0:
+            if len(self.lower_half) + len(self.higher_half) > \
+               2 * len(self._window):
+                self._rebuild()
+        if self._lower_len == 0 or item <= self.lower_half.peek():
+            self.lower_half.insert(item)
+            self._lower_len += 1
+        else:
+            self.higher_half.insert(item)
+            self._higher_len += 1
+        self._balance()
+        self._window.append(item)
+        if len(self._window) > self.window_size:
+            self._remove(self._window.popleft())
+    
+    def median(self, if_even=EvenChoice.Lower):
+        """
+        Return the median of the items in the window.
+        
+        if_even -- Choose what to return if the number of items in the 
+                   window is even; see MedianMaintainer.median
+        
+        Raises LookupError if no items have been inserted.
+        """
+        if len(self._window) == 0:
+            raise LookupError('median of no items')
+        if self._lower_len > self._higher_len:
+            # single median
+            return self.lower_half.peek()
+        # even number of items; two "medians"
+        if if_even == EvenChoice.Higher:
+            return self.higher_half.peek()
+        elif if_even == EvenChoice.Both:
+            return (self.lower_half.peek(), self.higher_half.peek())
+        elif if_even == EvenChoice.Average:
+            return self.lower_half.peek() + \
+                   (self.higher_half.peek() - self.lower_half.peek()) / 2
+        else:
+            return self.lower_half.peek()
+
+
+def _exact_fraction(q):
+    """
+    Return q as a Fraction, checking that 0 <= q <= 1.
+    
+    Floats are converted to the closest simple fraction, so that e.g. 0.1 is 
+    exactly 1/10 (and 0.1 * 30 is exactly 3).
+    """
+    q = fractions.Fraction(q).limit_denominator(10**9)
+    if not 0 <= q <= 1:
+        raise ValueError('quantile must be between 0 and 1')
+    return q
+
+
+def _nearest_rank(q, num_items):
+    """
+    Return the (1-based) rank of the q-quantile of num_items items.
+    
+    q -- a Fraction between 0 and 1
+    
+    This is the nearest-rank definition, i.e. ceil(q * num_items), but at 
+    least 1. For q = 1/2 this is the lower median.
+    """
+    return max(1, -(-q.numerator * num_items // q.denominator))
+
+
+class QuantileMaintainer:
+    """
+    Maintain the q-quantile of a stream of items online (i.e. in real-time).
+    
+    This generalizes MedianMaintainer (which maintains the 0.5-quantile) to 
+    any q between 0 and 1, e.g. q = 0.99 for the 99th percentile. The 
+    q-quantile of n items is the item with (1-based) rank ceil(q * n) (but 
+    at least 1), i.e. we use the nearest-rank definition.
+    
+    Complexity:
+    - each insertion is O(log(n)), where n is the number of items inserted 
+      so far
+    - retrieving the quantile is O(1)
+    
+    Like MedianMaintainer this uses a max heap `lower_half` and a min heap 
+    `higher_half`, but keeps exactly ceil(q * n) items in the lower one, so 
+    the quantile is always on top of it.
+    """
+    
+    def __init__(self, q):
+        """
+        Initialize an empty structure.
+        
+        q -- the quantile to maintain; a number between 0 and 1
+        """
+        self.q = q
+        self._q = _exact_fraction(q)
+        # a max heap for the items up to the quantile
+        self.lower_half = binary_heap.BinaryHeap(max_=True)
+        # a min heap for the items above the quantile
+        self.higher_half = binary_heap.BinaryHeap(max_=False)
+    
+    def __len__(self):
+        """
+        Return the number of items inserted so far.
+        """
+        return len(self.lower_half) + len(self.higher_half)
+    
+    def insert(self, item):
+        """
+        Insert item in the structure.
+        
+        item -- an item; we assume it can be compared with all other items in
+                the structure
+        
+        Complexity is O(log(n)), where n is the number of items inserted so
+        far.
+        """
+        if len(self.lower_half) == 0 or item <= self.lower_half.peek():
+            self.lower_half.insert(item)
+        else:
+            self.higher_half.insert(item)
+        # the target size changes by at most one per insertion, so we move 
+        # at most one item
+        target = _nearest_rank(self._q, len(self))
+        if len(self.lower_half) > target:
+            self.higher_half.insert(self.lower_half.pop())
+        elif len(self.lower_half) < target:
+            self.lower_half.insert(self.higher_half.pop())
+    
+    def quantile(self):
+        """
+        Return the q-quantile of the items inserted so far.
+        
+        Raises LookupError if no items have been inserted.
+        """
+        if len(self.lower_half) == 0:
+            raise LookupError('quantile of no items')
+        return self.lower_half.peek()
+    
+    def merge(self, other):
+        """
+        Insert all items of another QuantileMaintainer into this one.
+        
+        other -- a QuantileMaintainer for the same q; it's left unchanged
+        
+        Works like MedianMaintainer.merge.
+        """
+        if other._q != self._q:
+            raise ValueError('cannot merge maintainers of different quantiles')
+        self.lower_half.merge(other.lower_half)
+        self.higher_half.merge(other.higher_half)
+        _uncross(self.lower_half, self.higher_half)
+        target = _nearest_rank(self._q, len(self))
+        while len(self.lower_half) > target:
+            self.higher_half.insert(self.lower_half.pop())
+        while len(self.lower_half) < target:
+            self.lower_half.insert(self.higher_half.pop())
+    
+    def to_bytes(self, typecode='d'):
+        """
+        Return a compact binary form of the structure.
+        
+        typecode -- an `array` typecode that fits all items, e.g. 'd' for 
+                    floats (default) or 'q' for 64-bit integers
+        """
+        return serialization.pack(
+            b'QNTM', typecode, [self._q.numerator, self._q.denominator], 
+            [self.lower_half._items, self.higher_half._items])
+    
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Return a new QuantileMaintainer from what to_bytes returned.
+        """
+        _, (numerator, denominator), (lower_items, higher_items) = \
+            serialization.unpack(data, b'QNTM')
+        result = cls(fractions.Fraction(numerator, denominator))
+        result.lower_half._items = lower_items
+        result.higher_half._items = higher_items
+        return result
+
+
+class MultiQuantileMaintainer:
+    """
+    Maintain a stream of items so that we can get any quantile at any point.
+    
+    Unlike QuantileMaintainer, the quantile doesn't need to be chosen in 
+    advance; we can e.g. ask for the 50th, 90th, 99th and 99.9th percentile 
+    of the same items.
+    
+    Complexity:
+    - each insertion is O(log(n)), where n is the number of items inserted 
+      so far
+    - retrieving any quantile (or the item of any rank) is O(log(n))
+    
+    The items are kept in an order-statistic tree, i.e. a balanced binary 
+    search tree where each node knows the size of its subtree (see 
+    binary_search_tree.AVLTree).
+    """
+    
+    def __init__(self):
+        """
+        Initialize an empty structure.
+        """
+        self._tree = binary_search_tree.AVLTree()
+    
+    def __len__(self):
+        """
+        Return the number of items inserted so far.
+        """
+        return len(self._tree)
+    
+    def insert(self, item):
+        """
+        Insert item in the structure.
+        
+        item -- an item; we assume it can be compared with all other items in
+                the structure
+        """
+        self._tree.insert(item)
+    
+    def select(self, k):
+        """
+        Return the k-th smallest item inserted so far, counting from 0.
+        
+        Raises IndexError if k is out of range.
+        """
+        return self._tree.select(k)
+    
+    def quantile(self, q):
+        """
+        Return the q-quantile of the items inserted so far.
+        
+        q -- a number between 0 and 1
+        
+        Uses the same (nearest-rank) definition as QuantileMaintainer.
+        
+        Raises LookupError if no items have been inserted.
+        """
+        q = _exact_fraction(q)
+        if len(self._tree) == 0:
+            raise LookupError('quantile of no items')
+        return self._tree.select(_nearest_rank(q, len(self._tree)) - 1)
+    
+    def quantiles(self, qs):
+        """
+        Return a list with the q-quantile for each q in qs.
+        """
+        return [self.quantile(q) for q in qs]
+    
+    def median(self, if_even=EvenChoice.Lower):
+        """
+        Return the median of the items inserted so far.
+        
+        if_even -- Choose what to return if the number of items inserted so 
+                   far is even; see MedianMaintainer.median
+        
+        Raises LookupError if no items have been inserted.
+        """
+        n = len(self._tree)
+        if n == 0:
+            raise LookupError('median of no items')
+        lower = self._tree.select((n - 1) // 2)
+        if n % 2 == 1:
+            return lower
+        higher = self._tree.select(n // 2)
+        if if_even == EvenChoice.Higher:
+            return higher
+        elif if_even == EvenChoice.Both:
+            return (lower, higher)
+        elif if_even == EvenChoice.Average:
+            return lower + (higher - lower) / 2
+        else:
+            return lower
+    
+    def merge(self, other):
+        """
+        Insert all items of another MultiQuantileMaintainer into this one.
+        
+        other -- a MultiQuantileMaintainer; it's left unchanged
+        
+        If other is big compared to this structure (see 
+        binary_heap.worth_heapifying), rebuild the tree from both trees' 
+        sorted items in O(n + m) time; otherwise insert other's items one 
+        by one, in O(m * log(n + m)) time.
+        """
+        if binary_heap.worth_heapifying(len(self._tree), len(other._tree)):
+            self._tree.merge(other._tree)
+        else:
+            for item in list(other._tree):
+                self._tree.insert(item)
+    
+    def to_bytes(self, typecode='d'):
+        """
+        Return a compact binary form of the structure.
+        
+        typecode -- an `array` typecode that fits all items, e.g. 'd' for 
+                    floats (default) or 'q' for 64-bit integers
+        """
+        return serialization.pack(b'MQNT', typecode, [], [list(self._tree)])
+    
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Return a new MultiQuantileMaintainer from what to_bytes returned.
+        """
+        _, _, (items,) = serialization.unpack(data, b'MQNT')
+        result = cls()
+        # the items were stored in sorted order
+        result._tree = binary_search_tree.AVLTree.from_sorted(items)
+        return result
@@ -0,0 +1,226 @@
+"""
+A pairing heap implementation (using nodes).
+
+A pairing heap is a heap-ordered multiway tree. Inserting and melding just 
+link two trees (the one with the "greater" root becomes the first child of 
+the other), and popping the top links the root's children in pairs, then 
+links the pairs from right to left.
+
+Operations:  
+- __len__
+- insert 
+- pop
+- peek
+- decrease_key
+- meld
+
+Complexity (amortized):
+- insert, peek and meld are O(1)
+- pop is O(log(n))
+- decrease_key is o(log(n)) (and O(1) in practice)
+
+Author:  
+  Christos Nitsas  
+  (nitsas)  
+  (chrisnitsas)
+
+Language:
+  Python 3(.4)
+
+Date:
+  October, 2026
+"""
+
+
+import operator
+
+
+__all__ = ['PairingHeap', 'Node']
+
+
+class Node:
+    """
+    A node in the pairing heap; insert returns it as a handle to the item.
+    
+    A node has an `item`, points to its first (leftmost) `child` and its 
+    next `sibling`, and to `prev`: its left sibling, or its parent if it is 
+    the leftmost child.
+    """
+    
+    __slots__ = ('item', 'child', 'sibling', 'prev')
+    
+    def __init__(self, item):
+        self.item = item
+        self.child = None
+        self.sibling = None
+        self.prev = None
+
+
+class PairingHeap:
+    """
+    A pairing heap implementation (using nodes).
+    
+    Has the same interface as binary_heap.BinaryHeap, plus decrease_key and 
+    meld. insert returns a handle (a Node) that can later be passed to 
+    decrease_key.
+    
+    A typical pattern for items is a tuple in the form: 
+    (priority_number, data).
+    """
+    
+    def __init__(self, max_=False):
+        """
+        Initialize an empty heap.
+        
+        max_ -- if True, make a max-heap; min-heap otherwise (default)
+        """
+        self._max = max_
+        if max_:
+            self._less = operator.gt
+        else:
+            self._less = operator.lt
+        self._root = None
+        self._len = 0
+    
+    def __len__(self):
+        """Return the number of items in the heap as an int."""
+        return self._len
+    
+    def _link(self, a, b):
+        """
+        Link two trees (given their roots) and return the new root.
+        
+        The root with the "greater" item becomes the first child of the 
+        other root.
+        """
+        if self._less(b.item, a.item):
+            a, b = b, a
+        # make b the first child of a
+        b.prev = a
+        b.sibling = a.child
+        if a.child is not None:
+            a.child.prev = b
+        a.child = b
+        a.sibling = None
+        a.prev = None
+        return a
+    
+    def insert(self, item):
+        """
+        Insert a new item and return its handle (a Node).
+        
+        item -- the item to be inserted
+        
+        This operation's time complexity is `O(1)`.
+        """
+        node = Node(item)
+        if self._root is None:
+            self._root = node
+        else:
+            self._root = self._link(self._root, node)
+        self._len += 1
+        return node
+    
+    def peek(self):
+        """
+        Return the item on top of the heap without removing the item.
+        
+        Raises a `LookupError('peek into empty heap')` if the heap is empty.
+        """
+        if self._root is None:
+            raise LookupError('peek into empty heap')
+        return self._root.item
+    
+    def _merge_pairs(self, first):
+        """
+        Link a list of sibling trees (given the first one) into a single 
+        tree and return its root.
+        
+        First pass: link the trees in pairs, left to right. Second pass: 
+        link the resulting trees right to left. Iterative, to avoid hitting 
+        the maximum recursion depth.
+        """
+        pairs = []
+        while first is not None:
+            a = first
+            b = a.sibling
+            if b is None:
+                a.prev = None
+                pairs.append(a)
+                break
+            first = b.sibling
+            a.sibling = b.sibling = None
+            pairs.append(self._link(a, b))
+        root = pairs.pop()
+        while len(pairs) > 0:
+            root = self._link(pairs.pop(), root)
+        return root
+    
+    def pop(self):
+        """
+        Remove and return the item that's currently on top of the heap.
+        
+        This operation's amortized time complexity is `O(log(n))`.
+        
+        Raises a `LookupError('pop from empty heap')` if the heap is empty.
+        """
+        root = self._root
+        if root is None:
+            raise LookupError('pop from empty heap')
+        if root.child is None:
+            self._root = None
+        else:
+            self._root = self._merge_pairs(root.child)
+        root.child = None
+        self._len -= 1
+        return root.item
+    
+    def _cut(self, node):
+        """Detach the subtree rooted at node from its parent or siblings."""
+        if node.prev.child is node:
+            # node is the leftmost child
+            node.prev.child = node.sibling
+        else:
+            node.prev.sibling = node.sibling
+        if node.sibling is not None:
+            node.sibling.prev = node.prev
+        node.prev = None
+        node.sibling = None
+    
+    def decrease_key(self, node, item):
+        """
+        Replace a node's item with a "lower" one (higher for a max-heap).
+        
+        node -- a handle returned by insert; its item must still be in the 
+                heap
+        item -- the new item; must not be "greater" than the node's item
+        
+        Cuts the node's subtree off and links it with the root.
+        
+        Raises a ValueError if the new item is "greater" than the old one.
+        """
+        if self._less(node.item, item):
+            raise ValueError('new item is greater than the current item')
+        node.item = item
+        if node is self._root:
+            return
+        self._cut(node)
+        self._root = self._link(self._root, node)
+    
+    def meld(self, other_heap):
+        """
+        Move all items of another pairing heap into this one, in O(1) time.
+        
+        other_heap -- a PairingHeap with the same ordering; it will be empty 
+                      afterwards (its handles are valid in this heap)
+        """
+        if other_heap._max != self._max:
+            raise ValueError('cannot meld a min-heap with a max-heap')
+        if other_heap._root is not None:
+            if self._root is None:
+                self._root = other_heap._root
+            else:
+                self._root = self._link(self._root, other_heap._root)
+        self._len += other_heap._len
+        other_heap._root = None
+        other_heap._len = 0
@@ -0,0 +1,400 @@
+"""
+An approximate quantile sketch for streams too big to keep in memory.
+
+Implements the KLL sketch (Karnin, Lang and Liberty, "Optimal Quantile
+Approximation in Streams", 2016). It keeps a small, bounded number of the
+items seen so far, each standing for a power-of-two number of items, and
+answers rank and quantile queries with a normalized rank error of about
+`error_bound(k)`, with high probability.
+
+Operations:
+- __len__
+- update
+- update_many
+- rank
+- quantile
+- quantiles
+- median
+- merge
+- to_bytes / from_bytes
+
+Author:
+  Christos Nitsas
+  (nitsas)
+  (chrisnitsas)
+
+Language:
+  Python 3(.4)
+
+Date:
+  October, 2026
+"""
+
+
+import math
+import random
+try:
+    import numpy
+except ImportError:
+    # numpy is only needed for the vectorized update_many
+    numpy = None
+# modules I've written:
+from ..algorithms import binary_search
+from . import serialization
+from .median_maintainer import EvenChoice
+
+
+__all__ = ['KLLSketch', 'error_bound', 'k_for_error_bound']
+
+
+# the size of each level is this factor times the size of the level above
+_CAPACITY_FACTOR = 2 / 3
+# the smallest level size
+_MIN_CAPACITY = 2
+# update_many feeds numpy arrays to the sketch in blocks of this size, so
+# memory stays bounded no matter how big the array is
+_BLOCK_SIZE = 2**16
+
+
+def error_bound(k):
+    """
+    Return the approximate normalized rank error of a sketch with size k.
+    
+    This is the empirical formula used by the DataSketches library for
+    sketches with the same structure; the error is below this with 99%
+    probability.
+    """
+    return 2.446 / k**0.9433
+
+
+def k_for_error_bound(epsilon):
+    """
+    Return the smallest sketch size k with error_bound(k) <= epsilon.
+    
+    epsilon -- the desired normalized rank error, e.g. 0.01 for 1%
+    """
+    if not 0 < epsilon < 1:
+        raise ValueError('epsilon must be between 0 and 1')
+    k = max(8, math.ceil((2.446 / epsilon)**(1 / 0.9433)))
+    while error_bound(k) > epsilon:
+        k += 1
+    return k
+
+
+class KLLSketch:
+    """
+    An approximate quantile sketch with bounded memory.
+    
+    The sketch keeps a list of levels (compactors). Items at level h stand
+    for 2**h items each. New items go to level 0. When a level gets full we
+    sort it and move every other item (starting at a random offset) to the
+    next level; the other half are dropped. Higher levels get bigger
+    capacities, lower ones smaller, so the whole sketch keeps about
+    3 * k items no matter how many items we've seen.
+    
+    The minimum and maximum items are tracked exactly.
+    
+    Every item must be comparable with all the others. For update_many and
+    numeric items numpy is used, if available, to sort whole blocks at once.
+    """
+    
+    def __init__(self, k=200, seed=None):
+        """
+        Initialize an empty sketch.
+        
+        k -- the size of the top level; bigger k means smaller error (see
+             error_bound and k_for_error_bound) but more memory
+        seed -- seed for the random number generator that picks which items
+                to keep on each compaction
+        """
+        if k < _MIN_CAPACITY:
+            raise ValueError('k must be at least {}'.format(_MIN_CAPACITY))
+        self.k = k
+        self._random = random.Random(seed)
+        self._levels = [[]]
+        self._num_retained = 0
+        self._max_retained = self._capacity(0)
+        self._len = 0
+        self._min = None
+        self._max = None
+        # sorted retained items and cumulative weights, built when needed
+        self._sorted = None
+    
+    def __len__(self):
+        """
+        Return the number of items seen so far.
+        """
+        return self._len
+    
+    @property
+    def num_retained(self):
+        """
+        The number of items the sketch actually keeps.
+        """
+        return self._num_retained
+    
+    def _capacity(self, level):
+        """
+        Return the capacity of the given level.
+        
+        The top level has capacity k; each level below has 2/3 of the
+        capacity of the one above, but at least _MIN_CAPACITY.
+        """
+        depth = len(self._levels) - level - 1
+        return max(_MIN_CAPACITY,
+                   int(math.ceil(self.k * _CAPACITY_FACTOR**depth)))
+    
+    def _add_level(self):
+        self._levels.append([])
+        self._max_retained = sum(self._capacity(level)
+                                 for level in range(len(self._levels)))
+    
+    def _compact(self, level):
+        """
+        Move half the items of the given level to the next level.
+        
+        If the level has an odd number of items, its smallest item stays.
+        """
+        if level + 1 == len(self._levels):
+            self._add_level()
+        items = self._levels[level]
+        items.sort()
+        odd = len(items) % 2
+        offset = self._random.getrandbits(1)
+        self._levels[level + 1].extend(items[odd + offset::2])
+        self._num_retained -= len(items) - odd - (len(items) - odd) // 2
+        del items[odd:]
+    
+    def _compress(self):
+        """
+        Compact full levels, bottom up, until the sketch is small enough.
+        """
+        level = 0
+        while self._num_retained >= self._max_retained:
+            if len(self._levels[level]) >= self._capacity(level):
+                self._compact(level)
+            level += 1
+            if level == len(self._levels):
+                level = 0
+    
+    def update(self, item):
+        """
+        Add one item to the sketch.
+        
+        Complexity is amortized O(log(k)).
+        """
+        self._levels[0].append(item)
+        self._num_retained += 1
+        self._len += 1
+        if self._min is None or item < self._min:
+            self._min = item
+        if self._max is None or item > self._max:
+            self._max = item
+        self._sorted = None
+        if self._num_retained >= self._max_retained:
+            self._compress()
+    
+    def update_many(self, items):
+        """
+        Add many items to the sketch.
+        
+        items -- an iterable of items, or a numpy array of numbers
+        
+        If items is a numpy array, it is fed to the sketch in blocks; each
+        block is sorted with numpy and compacted straight into level 1,
+        which is much faster than adding its items one by one (compacting a
+        bigger sorted block at once doesn't increase the error).
+        """
+        if numpy is None or not isinstance(items, numpy.ndarray):
+            for item in items:
+                self.update(item)
+            return
+        items = items.ravel()
+        for begin in range(0, len(items), _BLOCK_SIZE):
+            self._update_block(items[begin:begin + _BLOCK_SIZE])
+    
+    def _update_block(self, block):
+        """
+        Add a (1-dimensional) numpy array of items to the sketch.
+        """
+        if len(block) == 0:
+            return
+        self._len += len(block)
+        block_min, block_max = block.min().item(), block.max().item()
+        if self._min is None or block_min < self._min:
+            self._min = block_min
+        if self._max is None or block_max > self._max:
+            self._max = block_max
+        self._sorted = None
+        level0 = self._levels[0]
+        if len(level0) + len(block) < self._capacity(0):
+            level0.extend(block.tolist())
+            self._num_retained += len(block)
+            return
+        # compact level 0 together with the whole block, in a dtype that 
+        # fits both (e.g. floats in level 0 and an integer block)
+        level0 = numpy.asarray(level0)
+        dtype = numpy.result_type(level0, block)
+        items = numpy.sort(numpy.concatenate((level0.astype(dtype), 
+                                              block.astype(dtype))))
+        if len(self._levels) == 1:
+            self._add_level()
+        odd = len(items) % 2
+        offset = self._random.getrandbits(1)
+        self._levels[0] = items[:odd].tolist()
+        self._levels[1].extend(items[odd + offset::2].tolist())
+        self._num_retained = sum(len(items) for items in self._levels)
+        if self._num_retained >= self._max_retained:
+            self._compress()
+    
+    def _sorted_view(self):
+        """
+        Return (items, cumulative_weights) for all retained items, sorted.
+        
+        cumulative_weights[i] is the total weight of items[0] to items[i].
+        """
+        if self._sorted is None:
+            weighted = []
+            for level, items in enumerate(self._levels):
+                weight = 1 << level
+                weighted.extend((item, weight) for item in items)
+            weighted.sort(key=lambda pair: pair[0])
+            items = [item for item, _ in weighted]
+            cumulative_weights = []
+            total = 0
+            for _, weight in weighted:
+                total += weight
+                cumulative_weights.append(total)
+            self._sorted = (items, cumulative_weights)
+        return self._sorted
+    
+    def rank(self, item):
+        """
+        Return the (approximate) number of items seen that are <= item.
+        """
+        items, cumulative_weights = self._sorted_view()
+        # the number of retained items <= item
+        index = binary_search.bisect(items, item)
+        while index < len(items) and items[index] == item:
+            index += 1
+        return 0 if index == 0 else cumulative_weights[index - 1]
+    
+    def _item_at_rank(self, rank):
+        """
+        Return the retained item whose (1-based) rank range includes rank.
+        """
+        if rank <= 1:
+            return self._min
+        if rank >= self._len:
+            return self._max
+        items, cumulative_weights = self._sorted_view()
+        index = binary_search.bisect(cumulative_weights, rank)
+        # the retained weights may not add up to exactly len(self)
+        return items[min(index, len(items) - 1)]
+    
+    def quantile(self, q):
+        """
+        Return the (approximate) q-quantile of the items seen so far.
+        
+        q -- a number between 0 and 1
+        
+        Like median_maintainer.QuantileMaintainer this returns the item with
+        rank ceil(q * n), or the minimum item for q = 0.
+        
+        Raises LookupError if no items have been seen.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError('quantile must be between 0 and 1')
+        if self._len == 0:
+            raise LookupError('quantile of no items')
+        return self._item_at_rank(math.ceil(q * self._len))
+    
+    def quantiles(self, qs):
+        """
+        Return a list with the (approximate) q-quantile for each q in qs.
+        """
+        return [self.quantile(q) for q in qs]
+    
+    def median(self, if_even=EvenChoice.Lower):
+        """
+        Return the (approximate) median of the items seen so far.
+        
+        if_even -- Choose what to return if the number of items seen so far
+                   is even; see median_maintainer.MedianMaintainer.median
+        
+        Raises LookupError if no items have been seen.
+        """
+        n = self._len
+        if n == 0:
+            raise LookupError('median of no items')
+        lower = self._item_at_rank((n + 1) // 2)
+        if n % 2 == 1:
+            return lower
+        higher = self._item_at_rank(n // 2 + 1)
+        if if_even == EvenChoice.Higher:
+            return higher
+        elif if_even == EvenChoice.Both:
+            return (lower, higher)
+        elif if_even == EvenChoice.Average:
+            return lower + (higher - lower) / 2
+        else:
+            return lower
+    
+    def merge(self, other):
+        """
+        Add all items seen by another sketch to this one.
+        
+        other -- a KLLSketch with the same k; it's left unchanged
+        
+        Each level is appended to the same level of this sketch, then full 
+        levels are compacted as usual. The merged sketch has the same error 
+        guarantee as a sketch that saw all items itself.
+        """
+        if other.k != self.k:
+            raise ValueError('cannot merge sketches with different k')
+        if len(other) == 0:
+            return
+        while len(self._levels) < len(other._levels):
+            self._add_level()
+        for level, items in enumerate(other._levels):
+            self._levels[level].extend(items)
+        self._num_retained += other._num_retained
+        self._len += other._len
+        if self._min is None or other._min < self._min:
+            self._min = other._min
+        if self._max is None or other._max > self._max:
+            self._max = other._max
+        self._sorted = None
+        if self._num_retained >= self._max_retained:
+            self._compress()
+    
+    def to_bytes(self, typecode='d'):
+        """
+        Return a compact binary form of the sketch.
+        
+        typecode -- an `array` typecode that fits all items, e.g. 'd' for 
+                    floats (default) or 'q' for 64-bit integers
+        
+        The random number generator's state is not included.
+        """
+        extremes = [] if self._len == 0 else [self._min, self._max]
+        return serialization.pack(b'KLLS', typecode, [self.k, self._len], 
+                                  [extremes] + self._levels)
+    
+    @classmethod
+    def from_bytes(cls, data, seed=None):
+        """
+        Return a new KLLSketch from what to_bytes returned.
+        
+        seed -- seed for the new sketch's random number generator
+        """
+        _, (k, len_), sequences = serialization.unpack(data, b'KLLS')
+        result = cls(k, seed)
+        if len_ > 0:
+            result._min, result._max = sequences[0]
+        for _ in range(len(sequences) - 2):
+            result._add_level()
+        result._levels = sequences[1:]
+        result._num_retained = sum(len(items) for items in result._levels)
+        result._len = len_
+        return result
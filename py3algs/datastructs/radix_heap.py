@@ -0,0 +1,129 @@
+"""
+A monotone radix heap for non-negative integer priorities.
+
+Items are kept in buckets by the highest bit in which their priority 
+differs from the last popped priority: bucket 0 holds items with priority 
+equal to the last popped one, and bucket i (i > 0) holds items whose 
+priority first differs from it in bit i-1. When bucket 0 runs out, we take 
+the first non-empty bucket, make its min priority the new "last" priority, 
+and redistribute its items into lower buckets. An item only ever moves to 
+lower buckets, so each item is moved at most O(log(C)) times, where C is 
+the max priority.
+
+Only works as a monotone min-heap: popped priorities never decrease, i.e. 
+one can't insert an item with lower priority than the last popped one. 
+This is exactly how Dijkstra's algorithm uses its heap.
+
+Operations:  
+- __len__
+- insert 
+- pop
+- peek
+
+Complexity:
+- insert is O(1)
+- pop is O(log(C)) amortized, and needs no item comparisons
+
+Author:  
+  Christos Nitsas  
+  (nitsas)  
+  (chrisnitsas)
+
+Language:
+  Python 3(.4)
+
+Date:
+  October, 2026
+"""
+
+
+__all__ = ['RadixHeap']
+
+
+class RadixHeap:
+    """
+    A monotone radix heap for non-negative integer priorities.
+    
+    Items must be tuples in the form: (priority, data), where priority is a 
+    non-negative integer. This matches the heaps in binary_heap, so 
+    RadixHeap can be used as dijkstra_sssp's heap_type.
+    """
+    
+    def __init__(self):
+        """
+        Initialize an empty heap.
+        """
+        # bucket i holds items whose priority first differs from self._last 
+        # in bit i-1; buckets are added as needed
+        self._buckets = [[]]
+        # the last popped (or peeked) priority; no smaller priorities can be 
+        # inserted
+        self._last = 0
+        self._len = 0
+    
+    def __len__(self):
+        """Return the number of items in the heap as an int."""
+        return self._len
+    
+    def insert(self, item):
+        """
+        Insert a new item.
+        
+        item -- a (priority, data) tuple
+        
+        This operation's time complexity is `O(1)`.
+        
+        Raises a ValueError if the priority is lower than the last popped 
+        (or peeked) priority.
+        """
+        priority = item[0]
+        if priority < self._last:
+            raise ValueError('priority lower than the last popped priority')
+        index = (priority ^ self._last).bit_length()
+        while index >= len(self._buckets):
+            self._buckets.append([])
+        self._buckets[index].append(item)
+        self._len += 1
+    
+    def _refill(self):
+        """
+        Make sure bucket 0 is not empty; the heap must not be empty.
+        
+        Takes the first non-empty bucket, makes its min priority the new 
+        last priority and redistributes its items into lower buckets (its 
+        min items go to bucket 0).
+        """
+        buckets = self._buckets
+        if len(buckets[0]) > 0:
+            return
+        i = 1
+        while len(buckets[i]) == 0:
+            i += 1
+        items = buckets[i]
+        buckets[i] = []
+        self._last = last = min(item[0] for item in items)
+        for item in items:
+            buckets[(item[0] ^ last).bit_length()].append(item)
+    
+    def peek(self):
+        """
+        Return the item with the lowest priority without removing it.
+        
+        Raises a `LookupError('peek into empty heap')` if the heap is empty.
+        """
+        if self._len == 0:
+            raise LookupError('peek into empty heap')
+        self._refill()
+        return self._buckets[0][-1]
+    
+    def pop(self):
+        """
+        Remove and return the item with the lowest priority.
+        
+        Raises a `LookupError('pop from empty heap')` if the heap is empty.
+        """
+        if self._len == 0:
+            raise LookupError('pop from empty heap')
+        self._refill()
+        self._len -= 1
+        return self._buckets[0].pop()
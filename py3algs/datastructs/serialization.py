@@ -0,0 +1,96 @@
+"""
+Helpers for the compact binary form (to_bytes / from_bytes) of structures.
+
+A packed structure is a small header (magic bytes, an `array` typecode, and
+the number of integers and sequences that follow), then some 64-bit 
+integers (e.g. sizes), then the sequences' lengths, then each sequence of 
+items as a raw array of the given typecode. Everything is little-endian.
+
+Used by median_maintainer and quantile_sketch.
+
+Operations:
+- pack
+- unpack
+
+Author:
+  Christos Nitsas
+  (nitsas)
+  (chrisnitsas)
+
+Language:
+  Python 3(.4)
+
+Date:
+  October, 2026
+"""
+
+
+import sys
+import array
+import struct
+
+
+__all__ = ['pack', 'unpack']
+
+
+# magic bytes, typecode, number of integers, number of sequences
+_HEADER = struct.Struct('<4scHH')
+
+
+def pack(magic, typecode, ints, sequences):
+    """
+    Return a compact binary form of some integers and sequences of items.
+    
+    magic -- four bytes identifying the structure
+    typecode -- an `array` typecode that fits the items, e.g. 'd' for floats 
+                or 'q' for 64-bit integers
+    ints -- a list of integers (e.g. sizes), packed as 64-bit integers
+    sequences -- a list of sequences of items, packed as arrays of the 
+                 given typecode
+    
+    Everything is stored little-endian, so the result can be unpacked on 
+    any machine.
+    """
+    parts = [_HEADER.pack(magic, typecode.encode('ascii'), len(ints), 
+                          len(sequences))]
+    lengths = [len(sequence) for sequence in sequences]
+    parts.append(struct.pack('<{}q'.format(len(ints) + len(sequences)), 
+                             *(list(ints) + lengths)))
+    for sequence in sequences:
+        items = array.array(typecode, sequence)
+        if sys.byteorder == 'big':
+            items.byteswap()
+        parts.append(items.tobytes())
+    return b''.join(parts)
+
+
+def unpack(data, magic):
+    """
+    Unpack what pack returned; return (typecode, ints, sequences).
+    
+    The sequences are returned as lists. Raises ValueError if data isn't 
+    the right kind of structure.
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError('data too short')
+    data_magic, typecode, num_ints, num_sequences = _HEADER.unpack_from(data)
+    if data_magic != magic:
+        raise ValueError('data is not a {!r} structure'.format(magic))
+    typecode = typecode.decode('ascii')
+    offset = _HEADER.size
+    numbers = struct.unpack_from('<{}q'.format(num_ints + num_sequences), 
+                                 data, offset)
+    offset += 8 * len(numbers)
+    ints, lengths = list(numbers[:num_ints]), numbers[num_ints:]
+    sequences = []
+    for length in lengths:
+        items = array.array(typecode)
+        end = offset + length * items.itemsize
+        if end > len(data):
+            raise ValueError('data too short')
+        items.frombytes(data[offset:end])
+        if sys.byteorder == 'big':
+            items.byteswap()
+        sequences.append(items.tolist())
+        offset = end
+    return typecode, ints, sequences
@@ -0,0 +1,276 @@
+"""
+A sorted container for large ordered (multi)sets, kept in sorted blocks.
+
+Instead of one node object per value (like the trees in binary_search_tree),
+the values are kept in a list of sorted Python lists (blocks) of up to a few
+thousand values each, plus a list with the biggest value of each block. A
+lookup is a binary search over the blocks' maxima and then one inside a
+block. An insertion or deletion shifts the values of a single block, which
+is a fast memmove, and a block that grows too big is split in two.
+
+Operations:
+- __len__
+- __contains__
+- __iter__, __reversed__
+- __getitem__ (indices and slices)
+- __delitem__ (indices and slices)
+- insert
+- extend
+- delete
+- find
+- bisect
+
+Author:
+  Christos Nitsas
+  (nitsas)
+  (chrisnitsas)
+
+Language:
+  Python 3(.4)
+
+Date:
+  October, 2026
+"""
+
+
+import itertools
+# modules I've written:
+from ..algorithms import binary_search
+
+
+__all__ = ['SortedList']
+
+
+class SortedList:
+    """
+    A sorted list of values, stored in sorted blocks.
+    
+    Equal values are allowed. Every value must be comparable with all
+    the others.
+    
+    Complexity, for n values and blocks of up to 2 * load values:
+    - __contains__: O(log(n))
+    - insert, delete: O(log(n) + load) (the block's memmove is fast)
+    - find, bisect, __getitem__: O(log(n)), plus O(n / load) for the first 
+      one after a modification, to recompute the blocks' offsets
+    
+    Memory is about one pointer per value (plus the values themselves),
+    instead of a whole node object per value.
+    """
+    
+    def __init__(self, iterable=None, load=1000):
+        """
+        Initialize the list.
+        
+        iterable -- values to put in the list initially; they don't have to
+                    be sorted
+        load -- the typical block size; blocks are split in two when they
+                get bigger than 2 * load
+        """
+        if load < 1:
+            raise ValueError('load must be positive')
+        self._load = load
+        self._len = 0
+        # the sorted blocks, and the biggest value in each block
+        self._blocks = []
+        self._maxes = []
+        # the index (in the whole list) of each block's first value; None
+        # when it must be recomputed
+        self._offsets = None
+        if iterable is not None:
+            self.extend(iterable)
+    
+    def __len__(self):
+        return self._len
+    
+    def __contains__(self, value):
+        index, position = self._locate(value)
+        return index < len(self._blocks) and \
+               self._blocks[index][position] == value
+    
+    def __iter__(self):
+        """
+        Yield the values in sorted order, lazily.
+        """
+        return itertools.chain.from_iterable(self._blocks)
+    
+    def __reversed__(self):
+        """
+        Yield the values in reverse sorted order, lazily.
+        """
+        return itertools.chain.from_iterable(
+               reversed(block) for block in reversed(self._blocks))
+    
+    def _reset(self, values):
+        """
+        Replace all the values with the given sorted list of values.
+        """
+        load = self._load
+        self._blocks = [values[begin:begin + load]
+                        for begin in range(0, len(values), load)]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._len = len(values)
+        self._offsets = None
+    
+    def extend(self, iterable):
+        """
+        Insert all values from the given iterable.
+        
+        If the batch is big compared to the list, all values are sorted
+        together and the blocks are rebuilt; otherwise they're inserted one
+        by one.
+        """
+        values = list(iterable)
+        if len(values) > self._len // 8:
+            values.extend(self)
+            values.sort()
+            self._reset(values)
+        else:
+            for value in values:
+                self.insert(value)
+    
+    def insert(self, value):
+        """
+        Insert the given value; O(log(n) + load).
+        """
+        self._offsets = None
+        self._len += 1
+        if len(self._blocks) == 0:
+            self._blocks.append([value])
+            self._maxes.append(value)
+            return
+        index = binary_search.bisect(self._maxes, value)
+        if index == len(self._blocks):
+            # bigger than everything; append it to the last block
+            index -= 1
+            self._blocks[index].append(value)
+            self._maxes[index] = value
+        else:
+            block = self._blocks[index]
+            block.insert(binary_search.bisect(block, value), value)
+        block = self._blocks[index]
+        if len(block) > 2 * self._load:
+            # split the block in two
+            half = len(block) // 2
+            self._blocks.insert(index + 1, block[half:])
+            self._maxes.insert(index, block[half - 1])
+            del block[half:]
+    
+    def _locate(self, value):
+        """
+        Return (block index, index in block) of the first value >= the given
+        one; the block index is len(self._blocks) if there's no such value.
+        """
+        index = binary_search.bisect(self._maxes, value)
+        if index == len(self._blocks):
+            return index, 0
+        return index, binary_search.bisect(self._blocks[index], value)
+    
+    def _block_offsets(self):
+        """
+        Return the index (in the whole list) of each block's first value.
+        """
+        if self._offsets is None:
+            self._offsets = [0]
+            self._offsets.extend(itertools.accumulate(
+                                 len(block) for block in self._blocks[:-1]))
+        return self._offsets
+    
+    def bisect(self, value):
+        """
+        Return the number of values smaller than the given one.
+        
+        Like binary_search.bisect, this is the index where value would be
+        inserted to keep the list sorted.
+        """
+        index, position = self._locate(value)
+        if index == len(self._blocks):
+            return self._len
+        return self._block_offsets()[index] + position
+    
+    def find(self, value):
+        """
+        Return the index of the first occurrence of the given value; None if
+        it's not in the list.
+        """
+        index, position = self._locate(value)
+        if index == len(self._blocks) or \
+           self._blocks[index][position] != value:
+            return None
+        return self._block_offsets()[index] + position
+    
+    def delete(self, value):
+        """
+        Remove one occurrence of the given value; O(log(n) + load).
+        
+        Raises KeyError if the value is not in the list.
+        """
+        index, position = self._locate(value)
+        if index == len(self._blocks) or \
+           self._blocks[index][position] != value:
+            raise KeyError(value)
+        self._delete_at(index, position)
+    
+    def _delete_at(self, index, position):
+        """
+        Remove the value at the given position of the given block.
+        """
+        block = self._blocks[index]
+        del block[position]
+        self._len -= 1
+        self._offsets = None
+        if len(block) == 0:
+            del self._blocks[index]
+            del self._maxes[index]
+        else:
+            self._maxes[index] = block[-1]
+    
+    def _position(self, index):
+        """
+        Return (block index, index in block) of the value at the given index
+        (in the whole list).
+        
+        Raises IndexError if the index is out of range.
+        """
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError('list index out of range')
+        offsets = self._block_offsets()
+        # the last block that starts at or before index
+        block_index = binary_search.bisect(offsets, index + 1) - 1
+        return block_index, index - offsets[block_index]
+    
+    def __getitem__(self, index):
+        """
+        Return the value at the given index, or a list for a slice.
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            if start >= stop:
+                return []
+            block_index, position = self._position(start)
+            result = []
+            while len(result) < stop - start:
+                block = self._blocks[block_index]
+                result.extend(block[position:position + stop - start -
+                                    len(result)])
+                block_index, position = block_index + 1, 0
+            return result
+        block_index, position = self._position(index)
+        return self._blocks[block_index][position]
+    
+    def __delitem__(self, index):
+        """
+        Remove the value at the given index, or the values in a slice.
+        
+        Deleting a slice rebuilds the blocks, in O(n) time.
+        """
+        if isinstance(index, slice):
+            values = list(self)
+            del values[index]
+            self._reset(values)
+            return
+        self._delete_at(*self._position(index))
@@ -14,7 +14,23 @@ Date:
 """
 
 
-__all__ = ['UnionFind', 'UnionFindSimpleImpl']
+import array
+try:
+    import numpy
+except ImportError:
+    # numpy is only needed for the bulk operations
+    numpy = None
+
+
+__all__ = ['UnionFind', 'UnionFindSimpleImpl', 
+           'UnionFindUnionByRankAndPathCompression', 'UnionFindWithRollback']
+
+
+def _id_typecode(n):
+    """Return the smallest array typecode that can hold ids 0 to n-1."""
+    if n <= 2**31:
+        return 'i'
+    return 'q'
 
 
 class UnionFindSimpleImpl:
@@ -115,10 +131,52 @@ class UnionFindUnionByRankAndPathCompression:
     A series of m union & find operations on a structure with n items 
     will need time O(m * a(n)), where a(n) is the reverse Ackerman 
     function.
+    
+    Items are mapped to integer ids 0, 1, ..., n-1 and the parent pointers 
+    and ranks are kept in compact `array.array`s. If the items are given as 
+    `range(n)` they are used as ids directly, and no dict is needed.
+    
+    If the items are given as `range(n)` and numpy is available, there are 
+    also vectorized bulk operations: find_many, union_many and components.
     """
     def __init__(self, items):
         """Initialize the Union-Find structure from an iterable."""
-        raise NotImplementedError()
+        if isinstance(items, range) and items.start == 0 and items.step == 1:
+            # the items are already integer ids
+            self._item = items
+            self._id = None
+        else:
+            self._item = list(set(items))
+            self._id = {item: i for i, item in enumerate(self._item)}
+        n = len(self._item)
+        self._parent = array.array(_id_typecode(n), range(n))
+        # ranks never exceed log2(n), so a byte each is plenty
+        self._rank = array.array('B', bytes(n))
+        self._num_clusters = n
+        # clusters are built lazily (see clusters()) and forgotten on union
+        self._clusters = None
+        self._items = None
+    
+    def _find_id(self, i):
+        """Return the root id of the tree that id i belongs to."""
+        parent = self._parent
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        # path compression: point everything on the path to the root
+        while parent[i] != root:
+            next_ = parent[i]
+            parent[i] = root
+            i = next_
+        return root
+    
+    def _item_id(self, item):
+        """Return the integer id of the given item."""
+        if self._id is None:
+            if not 0 <= item < len(self._item):
+                raise KeyError(item)
+            return item
+        return self._id[item]
     
     def __getitem__(self, item):
         """
@@ -127,7 +185,7 @@ class UnionFindUnionByRankAndPathCompression:
         
         Equivalent to UnionFind.find().
         """
-        raise NotImplementedError()
+        return self._item[self._find_id(self._item_id(item))]
     
     
     def find(self, item):
@@ -137,47 +195,287 @@ class UnionFindUnionByRankAndPathCompression:
         
         Equivalent to UnionFind.__getitem__().
         """
-        raise NotImplementedError()
+        return self[item]
     
     def union(self, item_a, item_b):
         """
         Join together the two clusters that items item_a and item_b 
         belong to.
         """
-        raise NotImplementedError()
+        root_a = self._find_id(self._item_id(item_a))
+        root_b = self._find_id(self._item_id(item_b))
+        if root_a == root_b:
+            return
+        # hang the shallower tree under the deeper one
+        rank = self._rank
+        if rank[root_a] < rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        if rank[root_a] == rank[root_b]:
+            rank[root_a] += 1
+        self._num_clusters -= 1
+        self._clusters = None
     
     def joined(self, item_a, item_b):
         """
         Return True it the items belong to the same cluster; False otherwise.
         """
-        raise NotImplementedError()
+        return self._find_id(self._item_id(item_a)) == \
+               self._find_id(self._item_id(item_b))
     
     def num_clusters(self):
         """Return the current number of clusters as an int."""
-        raise NotImplementedError()
+        return self._num_clusters
     
     def clusters(self):
         """
-        Return all clusters as a (real-time) dictview of lists.
+        Return all clusters as a dictview of lists.
+        
+        The clusters are built lazily on the first call (in O(n * a(n)) 
+        time) and reused until the next union that actually merges two 
+        clusters.
         
         Caution: 
-        The result is a real-time view of the clusters, i.e. if one first
-        calls this method to get a clusters_view object and then merges two
-        clusters, the original clusters_view object will reflect the change.
+        Unlike UnionFindSimpleImpl, the result is *not* a real-time view; it 
+        reflects the clusters at the time of the call. Don't mutate the 
+        inner lists, they may be returned again by later calls.
+        """
+        if self._clusters is None:
+            clusters = dict()
+            for i, item in enumerate(self._item):
+                root = self._item[self._find_id(i)]
+                try:
+                    clusters[root].append(item)
+                except KeyError:
+                    clusters[root] = [item]
+            self._clusters = clusters
+        return self._clusters.values()
+    
+    def _bulk_views(self):
+        """
+        Return numpy views (parent, rank) of the parent and rank arrays.
         
-        One can use list(myunionfindobject.clusters()) if they want a list of 
-        lists. BUT this is even more dangerous if there are more unions to 
-        come, because some of the inner lists of the result will change or
-        stop being valid after a union operation.
+        The views share memory with the arrays, so writing to them updates 
+        the structure.
+        
+        Raises a TypeError if the structure wasn't built on `range(n)`, and 
+        an ImportError if numpy isn't available.
+        """
+        if numpy is None:
+            raise ImportError('bulk operations need numpy')
+        if self._id is not None:
+            raise TypeError('bulk operations need items given as range(n)')
+        parent = numpy.frombuffer(self._parent, dtype=self._parent.typecode)
+        rank = numpy.frombuffer(self._rank, dtype=numpy.uint8)
+        return parent, rank
+    
+    def _bulk_ids(self, xs):
+        """Return xs as a numpy array of ids; check they are in range."""
+        xs = numpy.asarray(xs)
+        if xs.size == 0:
+            return xs.astype(self._parent.typecode)
+        # check the original values, before a cast could wrap or truncate
+        if xs.dtype.kind not in 'iu':
+            raise KeyError('ids must be integers')
+        if xs.min() < 0 or xs.max() >= len(self._item):
+            raise KeyError('ids out of range')
+        return xs.astype(self._parent.typecode)
+    
+    @staticmethod
+    def _compress_all(parent):
         """
-        raise NotImplementedError()
+        Point every id straight at its root, using pointer jumping.
+        
+        In every (vectorized) round, each id whose parent isn't a root 
+        jumps to its grandparent, all at once. That halves every id's 
+        distance to its root, so this takes O(log(depth)) rounds of at most 
+        O(n) work each, even for the long chains union_many can build.
+        """
+        nodes = numpy.flatnonzero(parent != parent[parent])
+        while nodes.size > 0:
+            parent[nodes] = parent[parent[nodes]]
+            nodes = nodes[parent[nodes] != parent[parent[nodes]]]
+    
+    @classmethod
+    def _bulk_roots(cls, parent, xs):
+        """
+        Return the root ids for an array of ids.
+        
+        Compresses every path first (see _compress_all), so afterwards each 
+        id points straight at its root.
+        """
+        cls._compress_all(parent)
+        return parent[xs]
+    
+    def find_many(self, xs):
+        """
+        Return the cluster leaders for a whole array of items.
+        
+        xs -- a numpy array (or a sequence) of items; the structure must 
+              have been built on `range(n)`, so items are integer ids
+        
+        Returns a numpy array with the leader of each item in xs. Works in 
+        vectorized pointer-jumping rounds over the whole structure, instead 
+        of one Python call per item; for batches much smaller than the 
+        structure, single finds are cheaper, so we use those.
+        """
+        parent, _ = self._bulk_views()
+        xs = self._bulk_ids(xs)
+        if 16 * xs.size < parent.size:
+            return numpy.array([self._find_id(x) for x in xs.tolist()], 
+                               dtype=parent.dtype).reshape(xs.shape)
+        return self._bulk_roots(parent, xs)
+    
+    def union_many(self, us, vs):
+        """
+        Join together the clusters of items us[i] and vs[i], for every i.
+        
+        us -- a numpy array (or a sequence) of items
+        vs -- a numpy array (or a sequence) of items, as long as us
+        
+        The structure must have been built on `range(n)`, so items are 
+        integer ids.
+        
+        Works in vectorized rounds: find the roots of all the pairs' items 
+        by pointer jumping, drop the pairs that are already joined, and hook 
+        each remaining pair's higher root under the lowest root it's paired 
+        with. Hooks always point to a lower id, so a round can't create 
+        cycles. We repeat until every pair is joined. 
+        
+        Unlike union, this hooks by id instead of by rank, so a round can 
+        build long chains (e.g. from pairs (0, 1), (1, 2), ...); the pointer 
+        jumping of the next round flattens them in O(log(depth)) steps. 
+        Ranks are only approximate afterwards: each new parent's rank is 
+        raised above its hooked root's rank from the start of the round, 
+        but roots hooked in the same round can end up with the same rank as 
+        their new parent. Later single unions still balance reasonably.
+        """
+        parent, rank = self._bulk_views()
+        us, vs = self._bulk_ids(us), self._bulk_ids(vs)
+        if us.shape != vs.shape:
+            raise ValueError('us and vs must have the same shape')
+        while us.size > 0:
+            us = self._bulk_roots(parent, us)
+            vs = self._bulk_roots(parent, vs)
+            crossing = us != vs
+            us, vs = us[crossing], vs[crossing]
+            if us.size == 0:
+                break
+            high = numpy.maximum(us, vs)
+            low = numpy.minimum(us, vs)
+            # hook each high root under the lowest root it's paired with
+            numpy.minimum.at(parent, high, low)
+            # keep ranks meaningful for later single unions
+            numpy.maximum.at(rank, parent[high], 
+                             numpy.minimum(rank[high], 254) + 1)
+            self._clusters = None
+        # count the roots once, instead of counting hooks in every round
+        self._num_clusters = int(numpy.count_nonzero(
+            parent == numpy.arange(parent.size)))
+    
+    def components(self):
+        """
+        Return a numpy array of labels; label i is the leader of item i.
+        
+        The structure must have been built on `range(n)`, so items are 
+        integer ids. Fully compresses every path, in vectorized 
+        pointer-jumping rounds.
+        """
+        parent, _ = self._bulk_views()
+        self._compress_all(parent)
+        return parent.copy()
     
     def items(self):
         """Return a set containing all the items in the structure."""
-        raise NotImplementedError()
+        if self._items is None:
+            self._items = set(self._item)
+        return self._items
+
+
+class UnionFindWithRollback(UnionFindUnionByRankAndPathCompression):
+    """
+    A Union-Find implementation (union by rank, no path compression) that 
+    can undo unions.
+    
+    Call snapshot() to get a point in the history of unions, and 
+    rollback(snapshot) to undo every union made since.
+    
+    Without path compression a find takes O(log(n)) time (union by rank 
+    keeps the trees shallow), but every union changes only a couple of 
+    array entries, so it can be undone in constant time. Useful for offline 
+    dynamic connectivity (see the dynamic_connectivity module).
+    
+    The bulk operations (find_many, union_many, components) are not 
+    supported, since they compress paths.
+    """
+    def __init__(self, items):
+        """Initialize the Union-Find structure from an iterable."""
+        super().__init__(items)
+        # a stack of (child root, parent root, parent rank grew) tuples, 
+        # one for each union that actually merged two clusters
+        self._history = []
+    
+    def _find_id(self, i):
+        """Return the root id of the tree that id i belongs to."""
+        parent = self._parent
+        while parent[i] != i:
+            i = parent[i]
+        return i
+    
+    def _bulk_views(self):
+        """Refuse bulk operations; see the class docstring."""
+        raise TypeError('bulk operations compress paths, which would break '
+                        'rollback')
+    
+    def union(self, item_a, item_b):
+        """
+        Join together the two clusters that items item_a and item_b 
+        belong to.
+        """
+        root_a = self._find_id(self._item_id(item_a))
+        root_b = self._find_id(self._item_id(item_b))
+        if root_a == root_b:
+            return
+        # hang the shallower tree under the deeper one
+        rank = self._rank
+        if rank[root_a] < rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        grew = rank[root_a] == rank[root_b]
+        if grew:
+            rank[root_a] += 1
+        self._history.append((root_b, root_a, grew))
+        self._num_clusters -= 1
+        self._clusters = None
+    
+    def snapshot(self):
+        """
+        Return the current point in the history of unions, as an int.
+        
+        Pass it to rollback() to undo all unions made after this call.
+        """
+        return len(self._history)
+    
+    def rollback(self, snapshot):
+        """
+        Undo all unions made since the given snapshot was taken.
+        
+        snapshot -- an int returned by snapshot()
+        
+        Takes O(k) time, where k is the number of unions undone.
+        """
+        if not 0 <= snapshot <= len(self._history):
+            raise ValueError('0 <= snapshot <= number of unions must hold')
+        while len(self._history) > snapshot:
+            child, parent, grew = self._history.pop()
+            self._parent[child] = child
+            if grew:
+                self._rank[parent] -= 1
+            self._num_clusters += 1
+            self._clusters = None
 
 
-_default_impl = UnionFindSimpleImpl
+_default_impl = UnionFindUnionByRankAndPathCompression
 
 
 class UnionFind:
@@ -185,7 +483,8 @@ class UnionFind:
     A Union-Find data structure interface.
     
     It relies on a concrete Union-Find implementation such as 
-    UnionFindSimpleImpl or UnionFindLazyUnionsAndPathCompressionImpl.
+    UnionFindSimpleImpl or UnionFindUnionByRankAndPathCompression 
+    (the default).
     """
     def __init__(self, items, *, impl=_default_impl):
         self._impl = impl(items)
@@ -194,4 +493,8 @@ class UnionFind:
         return self._impl.__getitem__(item)
     
     def __getattr__(self, name):
-        return getattr(self._impl, name)
+        attr = getattr(self._impl, name)
+        if callable(attr):
+            # remember bound methods, so that later calls skip __getattr__
+            setattr(self, name, attr)
+        return attr
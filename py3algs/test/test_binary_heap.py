@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+
+
+import unittest
+import random
+# modules I've written:
+from py3algs.datastructs import binary_heap
+from py3algs.datastructs import pairing_heap
+from py3algs.datastructs import fibonacci_heap
+from py3algs.datastructs import bucket_queue
+from py3algs.datastructs import radix_heap
+
+
+def make_items(num_items, seed=None):
+    # (if we use the same seed every time, we'll get the same items)
+    rng = random.Random(seed)
+    return [(rng.randint(0, num_items // 2), i) for i in range(num_items)]
+
+
+def drain(heap):
+    # pop everything; the result should be sorted
+    result = []
+    while len(heap) > 0:
+        result.append(heap.pop())
+    return result
+
+
+class HeapTestCase(unittest.TestCase):
+    """
+    Test the heaps against sorted().
+    
+    The items are (priority, data) tuples drawn using a seeded random number
+    generator, with many repeated priorities.
+    """
+    
+    def check_heap_type(self, heap_type, **kwargs):
+        """
+        Check heapify, insert, peek and pop, for a min-heap and a max-heap.
+        """
+        items = make_items(500, seed=0)
+        for max_ in (False, True):
+            expected = sorted(items, reverse=max_)
+            heap = heap_type(list(items), max_=max_, **kwargs)
+            self.assertEqual(len(heap), len(items))
+            self.assertEqual(heap.peek(), expected[0])
+            self.assertEqual(drain(heap), expected)
+            heap = heap_type(max_=max_, **kwargs)
+            for item in items:
+                heap.insert(item)
+            self.assertEqual(drain(heap), expected)
+            self.assertRaises(LookupError, heap.pop)
+            self.assertRaises(LookupError, heap.peek)
+            self.check_bulk_operations(heap_type, items, max_, **kwargs)
+    
+    def check_bulk_operations(self, heap_type, items, max_, **kwargs):
+        """
+        Check extend, merge, pushpop, replace and nsmallest.
+        """
+        expected = sorted(items, reverse=max_)
+        # extend: small batches (one by one) and big batches (heapify)
+        heap = heap_type(max_=max_, **kwargs)
+        heap.extend(items[:3])
+        heap.extend(items[3:])
+        self.assertEqual(heap.nsmallest(10), expected[:10])
+        self.assertEqual(heap.nsmallest(len(items) + 5), expected)
+        self.assertEqual(heap.nsmallest(0), [])
+        self.assertEqual(len(heap), len(items))
+        # merge
+        other = heap_type(list(items[:100]), max_=max_, **kwargs)
+        heap.merge(other)
+        self.assertEqual(len(other), 100)
+        self.assertEqual(drain(heap), sorted(items + items[:100], 
+                                             reverse=max_))
+        # pushpop and replace against their slow equivalents
+        heap = heap_type(list(items[:50]), max_=max_, **kwargs)
+        slow = heap_type(list(items[:50]), max_=max_, **kwargs)
+        for item in items[50:150]:
+            slow.insert(item)
+            self.assertEqual(heap.pushpop(item), slow.pop())
+        for item in items[150:250]:
+            expected_item = slow.pop()
+            slow.insert(item)
+            self.assertEqual(heap.replace(item), expected_item)
+        self.assertEqual(drain(heap), drain(slow))
+        self.assertRaises(LookupError, heap.replace, items[0])
+        self.assertEqual(heap.pushpop(items[0]), items[0])
+    
+    def test_binary_heap(self):
+        """
+        Test BinaryHeap.
+        """
+        self.check_heap_type(binary_heap.BinaryHeap)
+    
+    def test_dary_heap(self):
+        """
+        Test DaryHeap with several arities.
+        """
+        for arity in (2, 3, 4, 5, 8):
+            self.check_heap_type(binary_heap.DaryHeap, arity=arity)
+        self.assertRaises(ValueError, binary_heap.DaryHeap, arity=1)
+    
+    def test_key_split_heap(self):
+        """
+        Test KeySplitHeap with float and integer priorities.
+        """
+        items = make_items(500, seed=4)
+        for typecode in ('d', 'q'):
+            for max_ in (False, True):
+                heap = binary_heap.KeySplitHeap(typecode, max_=max_)
+                for priority, data in items:
+                    heap.insert(priority, data)
+                self.assertEqual(len(heap), len(items))
+                self.assertEqual(heap.peek()[0], 
+                                 max(items)[0] if max_ else min(items)[0])
+                popped = drain(heap)
+                # ties may come out in any order; priorities must be sorted
+                self.assertEqual([p for p, _ in popped], 
+                                 sorted((p for p, _ in items), reverse=max_))
+                self.assertEqual(sorted(popped), sorted(items))
+                self.assertRaises(LookupError, heap.pop)
+    
+    def test_heapify_any_arity(self):
+        """
+        Test that heapify gives every node a parent that's not greater.
+        """
+        items = make_items(200, seed=1)
+        for arity in (2, 3, 4, 7):
+            list_ = list(items)
+            binary_heap.heapify(list_, arity=arity)
+            for child in range(1, len(list_)):
+                self.assertLessEqual(list_[(child - 1) // arity], list_[child])
+    
+    def test_heaps_with_decrease_key(self):
+        """
+        Test PairingHeap and FibonacciHeap, including decrease_key and meld.
+        """
+        rng = random.Random(2)
+        for heap_type in (pairing_heap.PairingHeap, 
+                          fibonacci_heap.FibonacciHeap):
+            for max_ in (False, True):
+                sign = -1 if max_ else 1
+                heap, other = heap_type(max_=max_), heap_type(max_=max_)
+                current, handles = dict(), dict()
+                for i in range(400):
+                    priority = rng.randint(0, 1000)
+                    target = other if i % 3 == 0 else heap
+                    handles[i] = target.insert((priority, i))
+                    current[i] = priority
+                    if i % 7 == 6:
+                        heap.meld(other)
+                        self.assertEqual(len(other), 0)
+                        # decrease a random item's priority
+                        j = rng.choice(list(current))
+                        current[j] -= sign * rng.randint(0, 100)
+                        heap.decrease_key(handles[j], (current[j], j))
+                    if i % 5 == 4:
+                        heap.meld(other)
+                        expected = sorted((p, j) for j, p in current.items())
+                        expected = expected[-1] if max_ else expected[0]
+                        self.assertEqual(heap.peek(), expected)
+                        self.assertEqual(heap.pop(), expected)
+                        del current[expected[1]]
+                heap.meld(other)
+                self.assertEqual(len(heap), len(current))
+                self.assertEqual(drain(heap), 
+                                 sorted(((p, j) for j, p in current.items()), 
+                                        reverse=max_))
+                self.assertRaises(LookupError, heap.pop)
+                handle = heap.insert((5, 0))
+                self.assertRaises(ValueError, heap.decrease_key, handle, 
+                                  (5 + sign, 0))
+    
+    def test_monotone_queues(self):
+        """
+        Test BucketQueue and RadixHeap, used the way Dijkstra uses them.
+        
+        Every inserted priority is the last popped priority plus a random 
+        weight in [0, 99].
+        """
+        for heap_type in (lambda: bucket_queue.BucketQueue(99), 
+                          radix_heap.RadixHeap):
+            rng = random.Random(3)
+            heap = heap_type()
+            expected = []
+            last, popped = 0, []
+            for i in range(2000):
+                item = (last + rng.randint(0, 99), i)
+                heap.insert(item)
+                expected.append(item)
+                if i % 3 == 2:
+                    peeked = heap.peek()
+                    item = heap.pop()
+                    self.assertEqual(item, peeked)
+                    last = item[0]
+                    popped.append(item)
+            popped.extend(drain(heap))
+            # priorities come out sorted, and no item is lost
+            self.assertEqual([p for p, _ in popped], 
+                             sorted(p for p, _ in expected))
+            self.assertEqual(sorted(popped), sorted(expected))
+            self.assertRaises(LookupError, heap.pop)
+            self.assertRaises(ValueError, heap.insert, (last - 1, None))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+
+
+import unittest
+import random
+import math
+import bisect
+# modules I've written:
+from py3algs.datastructs import binary_search_tree
+
+
+def check_avl(test_case, node):
+    """
+    Check the stored height and size, and the balance, of every node in the 
+    subtree.
+    """
+    heights = {None: 0}
+    # iterative post-order traversal
+    stack = [(node, False)]
+    while len(stack) > 0:
+        node, children_done = stack.pop()
+        if node is None:
+            continue
+        if not children_done:
+            stack.append((node, True))
+            stack.append((node.left, False))
+            stack.append((node.right, False))
+            continue
+        left, right = heights[node.left], heights[node.right]
+        test_case.assertLessEqual(abs(left - right), 1)
+        test_case.assertEqual(node.height, 1 + max(left, right))
+        heights[node] = node.height
+        sizes = [0 if child is None else child.size 
+                 for child in (node.left, node.right)]
+        test_case.assertEqual(node.size, 1 + sum(sizes))
+
+
+def in_order(node):
+    # iterative in-order traversal
+    values = []
+    stack = []
+    while len(stack) > 0 or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        values.append(node.value)
+        node = node.right
+    return values
+
+
+class AVLTreeTestCase(unittest.TestCase):
+    """
+    Test AVLTree against a sorted list, checking the balance as we go.
+    """
+    
+    def check_tree(self, tree, values):
+        check_avl(self, tree.root())
+        self.assertEqual(in_order(tree.root()), sorted(values))
+        self.assertEqual(len(tree), len(values))
+        if len(values) > 0:
+            self.assertLessEqual(tree.height(), 
+                                 1.45 * math.log2(len(values) + 2))
+    
+    def test_sorted_insertions(self):
+        """
+        Test that sorted insertions don't make a degenerate tree.
+        """
+        tree = binary_search_tree.AVLTree()
+        for value in range(2000):
+            tree.insert(value)
+        self.check_tree(tree, list(range(2000)))
+        self.assertIn(1999, tree)
+        self.assertNotIn(2000, tree)
+        self.assertEqual(tree.find(1234).value, 1234)
+        self.assertIs(binary_search_tree.BinarySearchTree, 
+                      binary_search_tree.AVLTree)
+    
+    def test_random_inserts_and_deletes(self):
+        """
+        Test random inserts and deletes, with many equal values.
+        """
+        rng = random.Random(0)
+        tree = binary_search_tree.AVLTree()
+        values = []
+        for step in range(3000):
+            if len(values) > 0 and rng.random() < 0.45:
+                value = rng.choice(values)
+                values.remove(value)
+                tree.delete(value)
+            else:
+                value = rng.randint(0, 300)
+                values.append(value)
+                tree.insert(value)
+            if step % 100 == 0:
+                self.check_tree(tree, values)
+        self.check_tree(tree, values)
+        for value in range(301):
+            self.assertEqual(value in tree, value in values)
+        self.assertRaises(KeyError, tree.delete, 1000)
+        for value in list(values):
+            tree.delete(value)
+        self.check_tree(tree, [])
+        self.assertIsNone(tree.root())
+    
+    def test_order_statistics(self):
+        """
+        Test rank, select and count_range against a sorted list.
+        """
+        rng = random.Random(1)
+        tree = binary_search_tree.AVLTree()
+        values = []
+        for step in range(1500):
+            if len(values) > 0 and rng.random() < 0.3:
+                value = rng.choice(values)
+                values.remove(value)
+                tree.delete(value)
+            else:
+                value = rng.randint(0, 200)
+                values.append(value)
+                tree.insert(value)
+            if step % 50 == 0:
+                values.sort()
+                for k in range(len(values)):
+                    self.assertEqual(tree.select(k), values[k])
+                for x in range(-1, 202, 3):
+                    self.assertEqual(tree.rank(x), 
+                                     bisect.bisect_left(values, x))
+                    for y in (x - 20, x + 7, x + 50):
+                        self.assertEqual(tree.count_range(x, y), 
+                                         len([v for v in values 
+                                              if x <= v < y]))
+        self.check_tree(tree, values)
+        self.assertRaises(IndexError, tree.select, len(values))
+        self.assertRaises(IndexError, tree.select, -1)
+    
+    def test_iterators_and_closest_values(self):
+        """
+        Test iteration, range scans and floor/ceiling/predecessor/successor 
+        on both tree classes, with many equal values.
+        """
+        rng = random.Random(2)
+        values = [rng.randint(0, 100) for _ in range(500)]
+        for tree_type in (binary_search_tree.AVLTree, 
+                          binary_search_tree.BinarySearchTreeUsingNodes):
+            tree = tree_type(values)
+            sorted_values = sorted(values)
+            self.assertEqual(list(tree), sorted_values)
+            self.assertEqual(list(reversed(tree)), sorted_values[::-1])
+            for lo in range(-1, 103, 4):
+                for hi in (lo - 1, lo, lo + 1, lo + 13, None):
+                    expected = [v for v in sorted_values 
+                                if lo <= v and (hi is None or v < hi)]
+                    self.assertEqual(list(tree.range(lo, hi)), expected)
+                self.assertEqual(list(tree.range(None, lo)), 
+                                 [v for v in sorted_values if v < lo])
+                below = [v for v in sorted_values if v < lo]
+                above = [v for v in sorted_values if v > lo]
+                self.assertEqual(tree.predecessor(lo), 
+                                 below[-1] if below else None)
+                self.assertEqual(tree.successor(lo), 
+                                 above[0] if above else None)
+                self.assertEqual(tree.floor(lo), 
+                                 lo if lo in values else tree.predecessor(lo))
+                self.assertEqual(tree.ceiling(lo), 
+                                 lo if lo in values else tree.successor(lo))
+    
+    def test_deep_tree_iteration(self):
+        """
+        Test that iterating a degenerate tree doesn't hit the recursion limit.
+        """
+        tree = binary_search_tree.BinarySearchTreeUsingNodes(range(3000), 
+                                                             no_shuffle=True)
+        self.assertEqual(sum(1 for _ in tree), 3000)
+        self.assertEqual(next(reversed(tree)), 2999)
+        self.assertEqual(next(tree.range(2990)), 2990)
+    
+    def test_from_sorted_and_union(self):
+        """
+        Test the balanced bulk build, union and merge.
+        """
+        for n in list(range(40)) + [1000, 1023, 1024]:
+            tree = binary_search_tree.AVLTree.from_sorted(range(n))
+            self.check_tree(tree, list(range(n)))
+            self.assertEqual(tree.height(), n.bit_length())
+            # the tree must keep working after the bulk build
+            tree.insert(n // 2)
+            tree.delete(n // 2)
+        self.assertRaises(ValueError, binary_search_tree.AVLTree.from_sorted, 
+                          [1, 3, 2])
+        rng = random.Random(3)
+        first = [rng.randint(0, 50) for _ in range(300)]
+        second = [rng.randint(25, 75) for _ in range(100)]
+        first_tree = binary_search_tree.AVLTree(first)
+        second_tree = binary_search_tree.AVLTree(second)
+        union = first_tree.union(second_tree)
+        self.check_tree(union, first + second)
+        self.assertEqual(len(first_tree), len(first))
+        first_tree.merge(binary_search_tree.AVLTree())
+        self.check_tree(first_tree, first)
+        first_tree.merge(second_tree)
+        self.check_tree(first_tree, first + second)
+        self.check_tree(second_tree, second)
+
+
+class EytzingerTreeTestCase(unittest.TestCase):
+    """
+    Test EytzingerTree against the bisect module, for many tree sizes.
+    """
+    
+    def test_against_bisect(self):
+        rng = random.Random(0)
+        for n in list(range(20)) + [31, 32, 33, 100, 1000]:
+            values = [rng.randint(0, 60) for _ in range(n)]
+            tree = binary_search_tree.EytzingerTree(values, typecode='q')
+            values.sort()
+            self.assertEqual(len(tree), n)
+            for x in range(-1, 62):
+                self.assertEqual(tree.bisect(x), bisect.bisect_left(values, x))
+                if x in values:
+                    self.assertEqual(tree.find(x), values.index(x))
+                    self.assertIn(x, tree)
+                else:
+                    self.assertIsNone(tree.find(x))
+                    self.assertNotIn(x, tree)
+    
+    @unittest.skipIf(binary_search_tree.numpy is None, 'needs numpy')
+    def test_many(self):
+        numpy = binary_search_tree.numpy
+        rng = numpy.random.RandomState(0)
+        for n in (0, 1, 2, 5, 64, 1000):
+            values = numpy.sort(rng.randint(0, 2000, size=n) / 2)
+            tree = binary_search_tree.EytzingerTree(values.tolist())
+            queries = rng.randint(-2, 2002, size=3000) / 2
+            expected = numpy.searchsorted(values, queries)
+            self.assertEqual(tree.bisect_many(queries).tolist(), 
+                             expected.tolist())
+            found = numpy.zeros(len(queries), dtype=bool)
+            found[expected < n] = values[expected[expected < n]] == \
+                                  queries[expected < n]
+            self.assertEqual(tree.find_many(queries).tolist(), 
+                             numpy.where(found, expected, -1).tolist())
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+
+import unittest
+import random
+import functools
+# modules I've written:
+from py3algs.algorithms import dijkstra_sssp
+from py3algs.datastructs import binary_heap
+from py3algs.datastructs import bucket_queue
+from py3algs.datastructs import fibonacci_heap
+from py3algs.datastructs import pairing_heap
+from py3algs.datastructs import radix_heap
+
+
+class Graph:
+    """
+    A tiny undirected graph with the parts of the (old) networkx API that 
+    dijkstra_sssp uses: nodes_iter, number_of_nodes and edges.
+    
+    test_dijkstra_sssp.py needs a networkx version with nodes_iter and 
+    edges_iter; this lets us test the heap choices without it.
+    """
+    
+    def __init__(self, num_nodes):
+        self._adj = {node: dict() for node in range(num_nodes)}
+    
+    def add_edge(self, u, v, **attrs):
+        self._adj[u][v] = attrs
+        self._adj[v][u] = attrs
+    
+    def nodes_iter(self):
+        return iter(self._adj)
+    
+    def number_of_nodes(self):
+        return len(self._adj)
+    
+    def edges(self, node=None, data=False):
+        # with data=True only; like networkx, edges(node) lists every edge 
+        # at node, and edges() lists every edge once
+        if node is not None:
+            return [(node, v, attrs) for v, attrs in self._adj[node].items()]
+        return [(u, v, attrs) for u in self._adj 
+                for v, attrs in self._adj[u].items() if u <= v]
+
+
+def make_graph(num_nodes, num_edges, max_weight, seed=None, scale=1):
+    # a random graph with random integer weights in [0, max_weight], each 
+    # divided by scale (a power of two keeps float sums exact) 
+    # (if we use the same seed every time, we'll get the same graph)
+    rng = random.Random(seed)
+    graph = Graph(num_nodes)
+    for _ in range(num_edges):
+        weight = rng.randint(0, max_weight)
+        graph.add_edge(rng.randrange(num_nodes), rng.randrange(num_nodes), 
+                       weight=weight if scale == 1 else weight / scale)
+    return graph
+
+
+def make_path(num_nodes, weight):
+    graph = Graph(num_nodes)
+    for node in range(num_nodes - 1):
+        graph.add_edge(node, node + 1, weight=weight)
+    return graph
+
+
+class DijkstraHeapsTestCase(unittest.TestCase):
+    """
+    Test dijkstra_sssp with every heap type against the BinaryHeap results.
+    """
+    
+    def check_heap_types(self, graph, heap_types):
+        """
+        Check that every heap type gives the BinaryHeap distances.
+        """
+        expected = dijkstra_sssp.solve(graph, 0, 
+                                       heap_type=binary_heap.BinaryHeap).dist
+        for heap_type in heap_types:
+            dist, pred = dijkstra_sssp.solve(graph, 0, heap_type=heap_type)
+            self.assertEqual(dist, expected)
+            # the predecessors must give the same distances back
+            for node, parent in pred.items():
+                if parent is not None:
+                    self.assertEqual(dist[node], dist[parent] + 
+                                     graph._adj[parent][node]['weight'])
+    
+    def test_monotone_heaps(self):
+        """
+        Test the bucket queue, the radix heap and the automatic pick.
+        """
+        for max_weight in (0, 1, 10, 1000):
+            graph = make_graph(300, 1200, max_weight, seed=max_weight)
+            self.check_heap_types(graph, [
+                functools.partial(bucket_queue.BucketQueue, max_weight), 
+                radix_heap.RadixHeap, 
+                None])
+    
+    def test_decrease_key_heaps(self):
+        """
+        Test the pairing heap and the Fibonacci heap.
+        """
+        heap_types = [pairing_heap.PairingHeap, fibonacci_heap.FibonacciHeap]
+        for seed, max_weight in enumerate((0, 1, 10, 1000)):
+            graph = make_graph(300, 1200, max_weight, seed=seed)
+            self.check_heap_types(graph, heap_types)
+        # float weights
+        for seed in range(3):
+            graph = make_graph(300, 1200, 100, seed=seed, scale=8)
+            self.check_heap_types(graph, heap_types)
+        self.check_heap_types(make_path(100, 0.5), heap_types)
+    
+    def test_pick_heap_type(self):
+        """
+        Test which heap type dijkstra_sssp picks for different weights.
+        """
+        pick = dijkstra_sssp._pick_heap_type
+        # tiny max weight: bucket queue
+        heap_type = pick(make_graph(100, 300, 16, seed=0), 'weight')
+        self.assertIs(heap_type.func, bucket_queue.BucketQueue)
+        # n * C <= m: bucket queue
+        heap_type = pick(make_graph(100, 20000, 40, seed=0), 'weight')
+        self.assertIs(heap_type.func, bucket_queue.BucketQueue)
+        # a long path with big weights would make Dial's algorithm scan 
+        # O(n * C) buckets: radix heap
+        graph = make_path(1000, 999)
+        self.assertIs(pick(graph, 'weight'), radix_heap.RadixHeap)
+        self.check_heap_types(graph, [None])
+        self.assertEqual(dijkstra_sssp.solve(graph, 0).dist[999], 999 * 999)
+        # non-integer or negative weights: binary heap
+        graph = make_path(10, 1.5)
+        self.assertIs(pick(graph, 'weight'), binary_heap.BinaryHeap)
+        graph = make_path(10, -1)
+        self.assertIs(pick(graph, 'weight'), binary_heap.BinaryHeap)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
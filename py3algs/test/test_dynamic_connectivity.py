@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+
+import unittest
+import random
+import collections
+# modules I've written:
+from py3algs.algorithms import dynamic_connectivity
+
+
+def bfs_component(edges, source):
+    # the set of nodes reachable from source, over a Counter of edges
+    adjacency = collections.defaultdict(set)
+    for (u, v), count in edges.items():
+        if count > 0:
+            adjacency[u].add(v)
+            adjacency[v].add(u)
+    seen = {source}
+    queue = collections.deque([source])
+    while len(queue) > 0:
+        node = queue.popleft()
+        for neighbor in adjacency[node]:
+            if neighbor not in seen:
+                seen.add(neighbor)
+                queue.append(neighbor)
+    return seen
+
+
+def brute_force(items, operations):
+    # answer every query with a BFS on the current edges
+    edges = collections.Counter()
+    answers = []
+    for operation in operations:
+        kind = operation[0]
+        if kind == 'add':
+            edges[tuple(sorted(operation[1:]))] += 1
+        elif kind == 'remove':
+            edges[tuple(sorted(operation[1:]))] -= 1
+        elif kind == 'connected':
+            answers.append(operation[2] in bfs_component(edges, operation[1]))
+        else:
+            unseen, count = set(items), 0
+            while len(unseen) > 0:
+                unseen -= bfs_component(edges, unseen.pop())
+                count += 1
+            answers.append(count)
+    return answers
+
+
+def make_operations(num_items, num_operations, seed=None):
+    # random adds (some of them repeated edges and self-loops), removes of 
+    # present edges, and queries (some of them on a single vertex)
+    # (if we use the same seed every time, we'll get the same operations)
+    rng = random.Random(seed)
+    present = []
+    operations = []
+    for _ in range(num_operations):
+        choice = rng.random()
+        if choice < 0.3:
+            if len(present) > 0 and rng.random() < 0.2:
+                # the same edge again
+                u, v = rng.choice(present)
+            else:
+                u, v = rng.randrange(num_items), rng.randrange(num_items)
+            present.append((u, v))
+            operations.append(('add', u, v))
+        elif choice < 0.5 and len(present) > 0:
+            u, v = present.pop(rng.randrange(len(present)))
+            # either direction must work
+            operations.append(('remove', v, u) if rng.random() < 0.5 
+                              else ('remove', u, v))
+        elif choice < 0.9:
+            u = rng.randrange(num_items)
+            v = u if rng.random() < 0.1 else rng.randrange(num_items)
+            operations.append(('connected', u, v))
+        else:
+            operations.append(('count',))
+    return operations
+
+
+class OfflineDynamicConnectivityTestCase(unittest.TestCase):
+    """
+    Test offline_dynamic_connectivity against a BFS after every event.
+    """
+    
+    def test_random_operations(self):
+        """
+        Test random sequences of adds, removes and queries.
+        """
+        for seed in range(10):
+            num_items = 4 + seed * 3
+            operations = make_operations(num_items, 300, seed=seed)
+            self.assertEqual(
+                dynamic_connectivity.solve(range(num_items), operations), 
+                brute_force(range(num_items), operations))
+    
+    def test_edge_added_twice(self):
+        """
+        Test that removing one copy of a doubled edge keeps it connected.
+        """
+        operations = [('add', 'a', 'b'), ('add', 'b', 'a'), 
+                      ('connected', 'a', 'b'), ('remove', 'a', 'b'), 
+                      ('connected', 'a', 'b'), ('count',), 
+                      ('remove', 'b', 'a'), ('connected', 'a', 'b'), 
+                      ('connected', 'c', 'c'), ('count',)]
+        self.assertEqual(dynamic_connectivity.solve('abc', operations), 
+                         [True, True, 2, False, True, 3])
+    
+    def test_single_vertex(self):
+        """
+        Test queries on a graph with a single vertex, and no operations.
+        """
+        operations = [('connected', 0, 0), ('add', 0, 0), ('count',), 
+                      ('remove', 0, 0), ('connected', 0, 0)]
+        self.assertEqual(dynamic_connectivity.solve([0], operations), 
+                         [True, 1, True])
+        self.assertEqual(dynamic_connectivity.solve([0], []), [])
+    
+    def test_bad_operations(self):
+        """
+        Test removing an absent edge and unknown operations.
+        """
+        self.assertRaises(ValueError, dynamic_connectivity.solve, 
+                          range(3), [('add', 0, 1), ('remove', 1, 2)])
+        self.assertRaises(ValueError, dynamic_connectivity.solve, 
+                          range(3), [('add', 0, 1), ('remove', 0, 1), 
+                                     ('remove', 1, 0)])
+        self.assertRaises(ValueError, dynamic_connectivity.solve, 
+                          range(3), [('join', 0, 1)])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
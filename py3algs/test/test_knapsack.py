@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+
+
+import unittest
+import random
+import itertools
+# modules I've written:
+from py3algs.algorithms import knapsack
+
+
+def make_items(num_items, max_value, max_size, seed=None):
+    # (if we use the same seed every time, we'll get the same items)
+    rng = random.Random(seed)
+    return [knapsack.Item(rng.randint(0, max_value), rng.randint(1, max_size))
+            for _ in range(num_items)]
+
+
+def brute_force(knapsack_size, items):
+    # try every subset of items; only usable for a handful of items
+    best = 0
+    for r in range(len(items) + 1):
+        for subset in itertools.combinations(items, r):
+            if sum(item.size for item in subset) <= knapsack_size:
+                best = max(best, sum(item.value for item in subset))
+    return best
+
+
+class KnapsackTestCase(unittest.TestCase):
+    """
+    Test the knapsack solvers against each other and against brute force.
+    
+    The items are drawn using a seeded random number generator, so each test
+    always gets the same items to work on.
+    """
+    
+    def check_selection(self, knapsack_size, items, solution):
+        """
+        Check that the chosen items fit and add up to the reported value.
+        """
+        chosen = [items[i] for i in solution.indices]
+        self.assertLessEqual(sum(item.size for item in chosen), knapsack_size)
+        self.assertEqual(sum(item.value for item in chosen), solution.value)
+    
+    def test_against_brute_force(self):
+        """
+        Test all exact solvers on small random instances.
+        """
+        for seed in range(20):
+            items = make_items(8, max_value=50, max_size=20, seed=seed)
+            knapsack_size = 40
+            expected = brute_force(knapsack_size, items)
+            solver = knapsack.Solver(knapsack_size, items)
+            self.assertEqual(solver.solve(), expected)
+            solution = solver.solve_with_items()
+            self.assertEqual(solution.value, expected)
+            self.check_selection(knapsack_size, items, solution)
+            self.assertEqual(len(set(solution.indices)), 
+                             len(solution.indices))
+            solution = knapsack.solve_by_value(knapsack_size, items)
+            self.assertEqual(solution.value, expected)
+            self.check_selection(knapsack_size, items, solution)
+            bnb = knapsack.BranchAndBoundSolver(knapsack_size, items)
+            solution = bnb.solve()
+            self.assertTrue(bnb.optimal)
+            self.assertEqual(solution.value, expected)
+            self.check_selection(knapsack_size, items, solution)
+    
+    def test_approximate(self):
+        """
+        Test that the FPTAS stays within its guarantee on huge sizes.
+        """
+        items = make_items(40, max_value=1000, max_size=10**9, seed=1)
+        knapsack_size = 5 * 10**9
+        exact = knapsack.solve_by_value(knapsack_size, items)
+        for epsilon in (0.5, 0.1, 0.01):
+            solution = knapsack.approximate(knapsack_size, items, epsilon)
+            self.check_selection(knapsack_size, items, solution)
+            self.assertGreaterEqual(solution.value, 
+                                    (1 - epsilon) * exact.value)
+        self.assertRaises(ValueError, knapsack.approximate, 
+                          knapsack_size, items, 0)
+    
+    def test_branch_and_bound_limits(self):
+        """
+        Test branch and bound with huge sizes, with and without a node limit.
+        """
+        items = make_items(40, max_value=1000, max_size=10**9, seed=2)
+        knapsack_size = 5 * 10**9
+        exact = knapsack.solve_by_value(knapsack_size, items)
+        solver = knapsack.BranchAndBoundSolver(knapsack_size, items)
+        solution = solver.solve()
+        self.assertTrue(solver.optimal)
+        self.assertEqual(solution.value, exact.value)
+        self.check_selection(knapsack_size, items, solution)
+        # with a tiny node limit we still get a feasible solution
+        solution = solver.solve(max_nodes=1)
+        self.assertFalse(solver.optimal)
+        self.assertLessEqual(solver.num_nodes, 1)
+        self.check_selection(knapsack_size, items, solution)
+    
+    def test_solve_with_items_on_larger_instance(self):
+        """
+        Test solve_with_items against the memoized solver.
+        """
+        items = make_items(60, max_value=1000, max_size=100, seed=0)
+        knapsack_size = 1000
+        solver = knapsack.Solver(knapsack_size, items)
+        solution = solver.solve_with_items()
+        self.assertEqual(solution.value, solver.solve())
+        self.check_selection(knapsack_size, items, solution)
+    
+    def test_solve_many(self):
+        """
+        Test solve_many against independent solves for each knapsack size.
+        """
+        items = make_items(30, max_value=100, max_size=50, seed=3)
+        knapsack_sizes = [0, 17, 250, 3, 100, 250, 64]
+        values = knapsack.solve_many(knapsack_sizes, items)
+        solutions = knapsack.solve_many(knapsack_sizes, items, with_items=True)
+        for size, value, solution in zip(knapsack_sizes, values, solutions):
+            expected = knapsack.Solver(size, items).solve()
+            self.assertEqual(value, expected)
+            self.assertEqual(solution.value, expected)
+            self.check_selection(size, items, solution)
+        self.assertEqual(knapsack.solve_many([], items), [])
+    
+    def test_bounded_and_unbounded(self):
+        """
+        Test the bounded and unbounded variants against expanded copies.
+        """
+        items = make_items(6, max_value=50, max_size=20, seed=4)
+        counts = [0, 1, 2, 3, 5, 7]
+        knapsack_size = 60
+        expanded = []
+        for item, count in zip(items, counts):
+            expanded.extend([item] * count)
+        solution = knapsack.solve_bounded(knapsack_size, items, counts)
+        self.assertEqual(solution.value, 
+                         knapsack.Solver(knapsack_size, expanded).solve())
+        self.check_selection(knapsack_size, items, solution)
+        for i, count in enumerate(counts):
+            self.assertLessEqual(solution.indices.count(i), count)
+        # unbounded: as many copies as could possibly fit
+        expanded = []
+        for item in items:
+            expanded.extend([item] * (knapsack_size // item.size))
+        solution = knapsack.solve_unbounded(knapsack_size, items)
+        self.assertEqual(solution.value, 
+                         knapsack.Solver(knapsack_size, expanded).solve())
+        self.check_selection(knapsack_size, items, solution)
+    
+    def test_degenerate_instances(self):
+        """
+        Test on no items, a single item, and a zero-sized knapsack.
+        """
+        self.assertEqual(knapsack.solve_with_items(10, []), (0, []))
+        items = [knapsack.Item(5, 3)]
+        self.assertEqual(knapsack.solve_with_items(10, items), (5, [0]))
+        self.assertEqual(knapsack.solve_with_items(2, items), (0, []))
+        self.assertEqual(knapsack.solve_with_items(0, items * 3), (0, []))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
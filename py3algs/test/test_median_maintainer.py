@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+
+
+import unittest
+import random
+import math
+import fractions
+# modules I've written:
+from py3algs.datastructs import median_maintainer
+from py3algs.datastructs.median_maintainer import EvenChoice
+
+
+class MedianMaintainerExtendTestCase(unittest.TestCase):
+    """
+    Test MedianMaintainer.extend against inserting the items one by one.
+    """
+    
+    def check_medians(self, maintainer, items):
+        items = sorted(items)
+        self.assertEqual(len(maintainer), len(items))
+        self.assertEqual(maintainer.median(), items[(len(items) - 1) // 2])
+        self.assertEqual(maintainer.median(EvenChoice.Higher), 
+                         items[len(items) // 2])
+    
+    def test_batches(self):
+        """
+        Test batches of all sizes, some bigger and some smaller than the 
+        structure, with later insertions in between.
+        """
+        rng = random.Random(0)
+        maintainer = median_maintainer.MedianMaintainer()
+        items = []
+        for batch_size in (0, 1, 5, 300, 2, 40, 1000, 3, 17):
+            batch = [rng.randint(0, 500) for _ in range(batch_size)]
+            maintainer.extend(iter(batch))
+            items.extend(batch)
+            if len(items) > 0:
+                self.check_medians(maintainer, items)
+            item = rng.randint(0, 500)
+            maintainer.insert(item)
+            items.append(item)
+            self.check_medians(maintainer, items)
+    
+    def test_single_item_batch_on_empty_maintainer(self):
+        """
+        Test extending an empty structure with a batch of one item.
+        """
+        maintainer = median_maintainer.MedianMaintainer()
+        maintainer.extend([7])
+        self.check_medians(maintainer, [7])
+        if median_maintainer.numpy is not None:
+            maintainer = median_maintainer.MedianMaintainer()
+            maintainer.extend(median_maintainer.numpy.array([2.5]))
+            self.check_medians(maintainer, [2.5])
+    
+    @unittest.skipIf(median_maintainer.numpy is None, 'needs numpy')
+    def test_numpy_batches(self):
+        """
+        Test the numpy fast path, mixed with plain list batches.
+        """
+        numpy = median_maintainer.numpy
+        rng = numpy.random.RandomState(0)
+        maintainer = median_maintainer.MedianMaintainer()
+        items = []
+        for batch_size in (1000, 10, 5000):
+            batch = rng.normal(size=batch_size)
+            maintainer.extend(batch)
+            items.extend(batch.tolist())
+            self.check_medians(maintainer, items)
+            maintainer.extend(batch[:3].tolist())
+            items.extend(batch[:3].tolist())
+            self.check_medians(maintainer, items)
+
+
+class WindowedMedianMaintainerTestCase(unittest.TestCase):
+    """
+    Test WindowedMedianMaintainer against sorting the window every time.
+    """
+    
+    def test_against_sorting(self):
+        """
+        Test on random streams with many duplicates and various window sizes.
+        """
+        for seed in range(10):
+            rng = random.Random(seed)
+            window_size = rng.randint(1, 30)
+            maintainer = median_maintainer.WindowedMedianMaintainer(window_size)
+            stream = []
+            for _ in range(1000):
+                item = rng.randint(0, 20)
+                maintainer.insert(item)
+                stream.append(item)
+                window = sorted(stream[-window_size:])
+                self.assertEqual(len(maintainer), len(window))
+                lower = window[(len(window) - 1) // 2]
+                higher = window[len(window) // 2]
+                self.assertEqual(maintainer.median(), lower)
+                self.assertEqual(maintainer.median(EvenChoice.Higher), higher)
+                self.assertEqual(maintainer.median(EvenChoice.Both) 
+                                 if len(window) % 2 == 0 else (lower, higher),
+                                 (lower, higher))
+                # lazy deletion must not let the heaps grow unboundedly
+                self.assertLessEqual(len(maintainer.lower_half) + 
+                                     len(maintainer.higher_half), 
+                                     2 * window_size + 2)
+    
+    def test_empty(self):
+        """
+        Test the errors on an empty structure and a bad window size.
+        """
+        maintainer = median_maintainer.WindowedMedianMaintainer(3)
+        self.assertRaises(LookupError, maintainer.median)
+        self.assertRaises(ValueError, 
+                          median_maintainer.WindowedMedianMaintainer, 0)
+
+
+def nearest_rank_quantile(sorted_items, q):
+    # the item with (1-based) rank ceil(q * n), but at least 1
+    rank = max(1, math.ceil(fractions.Fraction(str(q)) * len(sorted_items)))
+    return sorted_items[rank - 1]
+
+
+class QuantileMaintainerTestCase(unittest.TestCase):
+    """
+    Test QuantileMaintainer and MultiQuantileMaintainer against sorting.
+    """
+    
+    qs = (0, 0.1, 0.25, 0.5, 0.9, 0.99, 0.999, 1)
+    
+    def test_against_sorting(self):
+        """
+        Test every quantile after every insertion of a random stream.
+        """
+        rng = random.Random(0)
+        maintainers = [median_maintainer.QuantileMaintainer(q) 
+                       for q in self.qs]
+        multi = median_maintainer.MultiQuantileMaintainer()
+        stream = []
+        for _ in range(1500):
+            item = rng.randint(0, 100)
+            stream.append(item)
+            for maintainer in maintainers:
+                maintainer.insert(item)
+            multi.insert(item)
+            sorted_items = sorted(stream)
+            expected = [nearest_rank_quantile(sorted_items, q) 
+                        for q in self.qs]
+            self.assertEqual([m.quantile() for m in maintainers], expected)
+            self.assertEqual(multi.quantiles(self.qs), expected)
+            self.assertEqual(multi.median(EvenChoice.Higher), 
+                             sorted_items[len(sorted_items) // 2])
+        for k in range(len(stream)):
+            self.assertEqual(multi.select(k), sorted_items[k])
+    
+    def test_median_compatibility(self):
+        """
+        Test that the 0.5-quantile is the lower median of MedianMaintainer.
+        """
+        rng = random.Random(1)
+        quantile = median_maintainer.QuantileMaintainer(0.5)
+        median = median_maintainer.MedianMaintainer()
+        for _ in range(300):
+            item = rng.random()
+            quantile.insert(item)
+            median.insert(item)
+            self.assertEqual(quantile.quantile(), median.median())
+    
+    def test_errors(self):
+        """
+        Test the errors on empty structures and bad arguments.
+        """
+        self.assertRaises(LookupError, 
+                          median_maintainer.QuantileMaintainer(0.9).quantile)
+        multi = median_maintainer.MultiQuantileMaintainer()
+        self.assertRaises(LookupError, multi.quantile, 0.5)
+        self.assertRaises(LookupError, multi.median)
+        self.assertRaises(IndexError, multi.select, 0)
+        self.assertRaises(ValueError, median_maintainer.QuantileMaintainer, 2)
+        self.assertRaises(ValueError, multi.quantile, -0.5)
+        # sorted insertions are fine too
+        for item in range(1000):
+            multi.insert(item)
+        self.assertEqual(multi.quantile(0.999), 998)
+
+
+class MergeAndSerializeTestCase(unittest.TestCase):
+    """
+    Test merging and to_bytes/from_bytes for the mergeable maintainers.
+    """
+    
+    def shards(self, num_shards, seed):
+        # a few shards of random integers, with different distributions
+        rng = random.Random(seed)
+        return [[rng.randint(0, 100 * (i + 1)) 
+                 for _ in range(rng.randint(0, 300))]
+                for i in range(num_shards)]
+    
+    def check_merge(self, make, check):
+        """
+        Build one structure per shard, roundtrip them through bytes, merge 
+        them, and check the result against the concatenated shards.
+        """
+        for seed in range(5):
+            shards = self.shards(5, seed)
+            structures = []
+            for shard in shards:
+                structure = make()
+                for item in shard:
+                    structure.insert(item)
+                structures.append(type(structure).from_bytes(
+                                  structure.to_bytes('q')))
+            merged = structures[0]
+            for structure in structures[1:]:
+                merged.merge(structure)
+            items = sorted(item for shard in shards for item in shard)
+            self.assertEqual(len(merged), len(items))
+            if len(items) > 0:
+                check(merged, items)
+    
+    def test_median_maintainer(self):
+        def check(merged, items):
+            self.assertEqual(merged.median(), items[(len(items) - 1) // 2])
+            self.assertEqual(merged.median(EvenChoice.Higher), 
+                             items[len(items) // 2])
+        self.check_merge(median_maintainer.MedianMaintainer, check)
+    
+    def test_quantile_maintainer(self):
+        def check(merged, items):
+            self.assertEqual(merged.quantile(), 
+                             nearest_rank_quantile(items, 0.9))
+            # the structure must still work after merging
+            merged.insert(-1)
+            self.assertEqual(merged.quantile(), 
+                             nearest_rank_quantile([-1] + items, 0.9))
+        self.check_merge(lambda: median_maintainer.QuantileMaintainer(0.9), 
+                         check)
+        self.assertRaises(ValueError, 
+                          median_maintainer.QuantileMaintainer(0.9).merge, 
+                          median_maintainer.QuantileMaintainer(0.5))
+    
+    def test_multi_quantile_maintainer(self):
+        def check(merged, items):
+            for k in range(len(items)):
+                self.assertEqual(merged.select(k), items[k])
+        self.check_merge(median_maintainer.MultiQuantileMaintainer, check)
+    
+    def test_bad_data(self):
+        data = median_maintainer.MedianMaintainer().to_bytes()
+        self.assertRaises(ValueError, 
+                          median_maintainer.QuantileMaintainer.from_bytes, 
+                          data)
+        self.assertRaises(ValueError, 
+                          median_maintainer.MedianMaintainer.from_bytes, 
+                          data[:3])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
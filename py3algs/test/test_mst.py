@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+
+
+import unittest
+import random
+# third-party modules:
+import networkx as nx
+# modules I've written:
+from py3algs.algorithms import mst
+from py3algs.algorithms import counting_sort
+
+
+def make_graph(num_nodes, num_edges, max_weight, seed=None, floats=False):
+    # a random undirected graph with random weights in [0, max_weight]
+    # (if we use the same seed every time, we'll get the same graph)
+    rng = random.Random(seed)
+    graph = nx.gnm_random_graph(num_nodes, num_edges, seed=seed)
+    for _, _, edge_attrs in graph.edges(data=True):
+        if floats:
+            edge_attrs['weight'] = rng.uniform(0, max_weight)
+        else:
+            edge_attrs['weight'] = rng.randint(0, max_weight)
+    return graph
+
+
+class MinimumSpanningForestTestCase(unittest.TestCase):
+    """
+    Test Kruskal's and Prim's algorithms against networkx.
+    """
+    
+    def check_graph(self, graph):
+        """
+        Check both algorithms and the automatic pick on the given graph.
+        
+        Compares the forest's weight with networkx's, and checks that the 
+        forest has one edge per node minus one per connected component, and 
+        that it really spans every component.
+        """
+        expected = sum(edge_attrs['weight'] for _, _, edge_attrs in 
+                       nx.minimum_spanning_edges(graph, data=True))
+        num_edges = graph.number_of_nodes() - \
+                    nx.number_connected_components(graph)
+        for algorithm in ('kruskal', 'prim', None):
+            forest = mst.solve(graph, algorithm=algorithm)
+            self.assertAlmostEqual(forest.weight, expected)
+            self.assertEqual(len(forest.edges), num_edges)
+            self.assertAlmostEqual(sum(w for _, _, w in forest.edges), 
+                                   forest.weight)
+            spanning = nx.Graph()
+            spanning.add_nodes_from(graph)
+            spanning.add_edges_from((u, v) for u, v, _ in forest.edges)
+            self.assertEqual(nx.number_connected_components(spanning), 
+                             nx.number_connected_components(graph))
+            for u, v, w in forest.edges:
+                self.assertEqual(graph[u][v]['weight'], w)
+    
+    def test_random_graphs(self):
+        """
+        Test on random graphs with small integer and with float weights.
+        """
+        for seed in range(5):
+            self.check_graph(make_graph(200, 1000, 99, seed=seed))
+            self.check_graph(make_graph(200, 1000, 10.0, seed=seed, 
+                                        floats=True))
+            # big integers: no counting sort
+            self.check_graph(make_graph(100, 400, 10**9, seed=seed))
+    
+    def test_disconnected_graphs(self):
+        """
+        Test on graphs with many components and isolated nodes.
+        """
+        for seed in range(5):
+            graph = make_graph(300, 200, 50, seed=seed)
+            self.assertGreater(nx.number_connected_components(graph), 1)
+            self.check_graph(graph)
+        graph = nx.Graph()
+        graph.add_nodes_from(['a', 'b', 'c'])
+        self.check_graph(graph)
+        self.assertEqual(mst.solve(nx.Graph()), (0, []))
+    
+    def test_equal_weights(self):
+        """
+        Test on graphs where every edge has the same weight.
+        """
+        graph = make_graph(150, 2000, 0, seed=0)
+        for _, _, edge_attrs in graph.edges(data=True):
+            edge_attrs['weight'] = 3
+        self.check_graph(graph)
+        graph = nx.complete_graph(40)
+        nx.set_edge_attributes(graph, 1, 'weight')
+        self.check_graph(graph)
+    
+    def test_dense_graphs(self):
+        """
+        Test on both sides of the Kruskal/Prim density threshold.
+        """
+        dense = make_graph(300, 300 * 299 // 2, 99, seed=1)
+        self.assertTrue(mst._prefer_prim(dense.number_of_nodes(), 
+                                         dense.number_of_edges()))
+        self.check_graph(dense)
+        sparse = make_graph(300, 128 * 300, 99, seed=1)
+        self.assertFalse(mst._prefer_prim(sparse.number_of_nodes(), 
+                                          sparse.number_of_edges()))
+        self.check_graph(sparse)
+    
+    def test_edge_lists(self):
+        """
+        Test kruskal and prim directly, with self-loops and parallel edges.
+        """
+        edges = [(0, 0, 1), (0, 1, 5), (1, 0, 2), (1, 2, 2), (2, 1, 9), 
+                 (3, 4, 7)]
+        for algorithm in (mst.kruskal, mst.prim):
+            forest = algorithm(6, edges)
+            self.assertEqual(forest.weight, 11)
+            self.assertEqual(sorted(w for _, _, w in forest.edges), [2, 2, 7])
+
+
+class SortIndicesTestCase(unittest.TestCase):
+    """
+    Test counting_sort.sort_indices against sorted().
+    """
+    
+    def test_sort_indices(self):
+        """
+        Test that sort_indices is a stable sort of the indices by key.
+        """
+        rng = random.Random(0)
+        keys = [rng.randint(0, 20) for _ in range(1000)]
+        indices = counting_sort.sort_indices(keys, 20)
+        # sorted() is stable too, so ties must come out in the same order
+        self.assertEqual(indices, sorted(range(len(keys)), 
+                                         key=keys.__getitem__))
+        self.assertEqual(counting_sort.sort_indices([], 5), [])
+        self.assertEqual(counting_sort.sort_indices([0, 0, 0], 0), [0, 1, 2])
+        # max_key is only an upper bound
+        self.assertEqual(counting_sort.sort_indices([3, 1, 2, 1], 100), 
+                         [1, 3, 2, 0])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
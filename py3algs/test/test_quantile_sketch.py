@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+
+import unittest
+import random
+import bisect
+# modules I've written:
+from py3algs.datastructs import quantile_sketch
+from py3algs.datastructs.median_maintainer import EvenChoice
+
+
+class KLLSketchTestCase(unittest.TestCase):
+    """
+    Test KLLSketch's rank error and memory bound against exact answers.
+    
+    The sketch and the items are seeded, so each test always gets the same
+    results.
+    """
+    
+    qs = [i / 100 for i in range(101)]
+    
+    def check_error(self, sketch, sorted_items):
+        """
+        Check every percentile is within the error bound of the exact one.
+        """
+        n = len(sorted_items)
+        # (allow twice the 99%-confidence bound, to be safe)
+        epsilon = 2 * quantile_sketch.error_bound(sketch.k)
+        for q in self.qs:
+            rank = bisect.bisect_right(sorted_items, sketch.quantile(q))
+            self.assertLessEqual(abs(rank / n - q), epsilon)
+        self.assertEqual(sketch.quantile(0), sorted_items[0])
+        self.assertEqual(sketch.quantile(1), sorted_items[-1])
+    
+    def test_update(self):
+        """
+        Test one-by-one updates; the sketch must stay small.
+        """
+        rng = random.Random(0)
+        items = [rng.gauss(0, 1) for _ in range(50000)]
+        sketch = quantile_sketch.KLLSketch(k=100, seed=0)
+        for item in items:
+            sketch.update(item)
+        self.assertEqual(len(sketch), len(items))
+        self.assertLess(sketch.num_retained, 4 * sketch.k)
+        self.check_error(sketch, sorted(items))
+        rank = sketch.rank(0)
+        self.assertLessEqual(abs(rank / len(items) - 0.5), 0.05)
+    
+    @unittest.skipIf(quantile_sketch.numpy is None, 'needs numpy')
+    def test_update_many(self):
+        """
+        Test the numpy update_many, in a few batches.
+        """
+        numpy = quantile_sketch.numpy
+        items = numpy.random.RandomState(0).exponential(size=300000)
+        sketch = quantile_sketch.KLLSketch(k=200, seed=0)
+        for batch in numpy.array_split(items, 7):
+            sketch.update_many(batch)
+        self.assertEqual(len(sketch), len(items))
+        self.assertLess(sketch.num_retained, 4 * sketch.k)
+        self.check_error(sketch, sorted(items.tolist()))
+    
+    @unittest.skipIf(quantile_sketch.numpy is None, 'needs numpy')
+    def test_mixed_updates(self):
+        """
+        Test update with floats followed by update_many with integers.
+        """
+        numpy = quantile_sketch.numpy
+        rng = random.Random(1)
+        for seed in range(20):
+            sketch = quantile_sketch.KLLSketch(k=8, seed=seed)
+            items = []
+            for _ in range(3):
+                floats = [rng.randint(0, 99) + 0.5 for _ in range(5)]
+                for item in floats:
+                    sketch.update(item)
+                # away from the floats, so a truncated float is never an 
+                # item we inserted
+                integers = numpy.arange(1000, 1000 + rng.randint(1, 200))
+                sketch.update_many(integers)
+                items.extend(floats + integers.tolist())
+            self.assertEqual(len(sketch), len(items))
+            # every retained item must be one we inserted (no truncation)
+            retained = [item for level in sketch._levels for item in level]
+            self.assertTrue(set(retained) <= set(items))
+            self.assertEqual(sketch.quantile(0), min(items))
+            self.assertEqual(sketch.quantile(1), max(items))
+        sketch = quantile_sketch.KLLSketch(k=200, seed=0)
+        items = []
+        for begin in range(0, 100000, 10000):
+            floats = [rng.uniform(0, 100000) for _ in range(500)]
+            for item in floats:
+                sketch.update(item)
+            integers = numpy.arange(begin, begin + 10000)
+            sketch.update_many(integers)
+            items.extend(floats + integers.tolist())
+        self.check_error(sketch, sorted(items))
+    
+    def test_small_and_empty(self):
+        """
+        Test that a sketch that hasn't compacted anything is exact.
+        """
+        sketch = quantile_sketch.KLLSketch(seed=0)
+        self.assertRaises(LookupError, sketch.median)
+        self.assertRaises(LookupError, sketch.quantile, 0.5)
+        sketch.update_many([5, 1, 4, 2])
+        self.assertEqual(sketch.median(), 2)
+        self.assertEqual(sketch.median(EvenChoice.Higher), 4)
+        self.assertEqual(sketch.median(EvenChoice.Both), (2, 4))
+        self.assertEqual(sketch.median(EvenChoice.Average), 3)
+        sketch.update(3)
+        self.assertEqual(sketch.median(), 3)
+        self.assertEqual(sketch.rank(3), 3)
+        self.assertRaises(ValueError, quantile_sketch.k_for_error_bound, 0)
+        k = quantile_sketch.k_for_error_bound(0.01)
+        self.assertLessEqual(quantile_sketch.error_bound(k), 0.01)
+    
+    def test_merge_and_serialize(self):
+        """
+        Test merging sketches built on shards, after a roundtrip to bytes.
+        """
+        rng = random.Random(1)
+        merged = quantile_sketch.KLLSketch(k=100, seed=0)
+        all_items = []
+        for shard in range(8):
+            items = [rng.uniform(shard, shard + 3) for _ in range(7000)]
+            all_items.extend(items)
+            sketch = quantile_sketch.KLLSketch(k=100, seed=shard)
+            for item in items:
+                sketch.update(item)
+            data = sketch.to_bytes()
+            # much smaller than the items themselves
+            self.assertLess(len(data), 8 * len(items) / 10)
+            sketch = quantile_sketch.KLLSketch.from_bytes(data, seed=shard)
+            merged.merge(sketch)
+        self.assertEqual(len(merged), len(all_items))
+        self.assertLess(merged.num_retained, 4 * merged.k)
+        self.check_error(merged, sorted(all_items))
+        self.assertRaises(ValueError, merged.merge, 
+                          quantile_sketch.KLLSketch(k=50))
+        empty = quantile_sketch.KLLSketch.from_bytes(
+                quantile_sketch.KLLSketch().to_bytes())
+        self.assertEqual(len(empty), 0)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+
+import unittest
+import random
+import bisect
+# modules I've written:
+from py3algs.datastructs import sorted_list
+
+
+class SortedListTestCase(unittest.TestCase):
+    """
+    Test SortedList against a plain sorted list.
+    
+    We use a tiny load so that blocks get split and emptied all the time.
+    """
+    
+    def check_list(self, sorted_list_, values):
+        """
+        Check the list's values and that its blocks are non-empty and small.
+        """
+        self.assertEqual(len(sorted_list_), len(values))
+        self.assertEqual(list(sorted_list_), values)
+        self.assertEqual(list(reversed(sorted_list_)), values[::-1])
+        for block in sorted_list_._blocks:
+            self.assertGreater(len(block), 0)
+            self.assertLessEqual(len(block), 2 * sorted_list_._load)
+    
+    def test_against_sorted_list(self):
+        """
+        Test random inserts and deletes, bisect, find and __contains__.
+        """
+        rng = random.Random(0)
+        container = sorted_list.SortedList(load=4)
+        values = []
+        for step in range(3000):
+            if len(values) > 0 and rng.random() < 0.4:
+                value = rng.choice(values)
+                values.remove(value)
+                container.delete(value)
+            else:
+                value = rng.randint(0, 200)
+                bisect.insort(values, value)
+                container.insert(value)
+            if step % 100 == 0:
+                self.check_list(container, values)
+                for x in range(-1, 202, 5):
+                    self.assertEqual(container.bisect(x), 
+                                     bisect.bisect_left(values, x))
+                    self.assertEqual(container.find(x), 
+                                     values.index(x) if x in values else None)
+                    self.assertEqual(x in container, x in values)
+        self.check_list(container, values)
+        self.assertRaises(KeyError, container.delete, 1000)
+    
+    def test_indices_and_slices(self):
+        """
+        Test indexing, slicing, deleting by index or slice, and extend.
+        """
+        rng = random.Random(1)
+        values = [rng.randint(0, 1000) for _ in range(500)]
+        container = sorted_list.SortedList(values, load=8)
+        values.sort()
+        self.check_list(container, values)
+        for index in (0, 1, 7, 8, 9, 250, 499, -1, -500):
+            self.assertEqual(container[index], values[index])
+        self.assertRaises(IndexError, container.__getitem__, 500)
+        self.assertRaises(IndexError, container.__getitem__, -501)
+        for _ in range(200):
+            start = rng.randint(-600, 600)
+            stop = rng.randint(-600, 600)
+            step = rng.choice((None, 1, 2, -1, -3))
+            self.assertEqual(container[start:stop:step], 
+                             values[start:stop:step])
+        for index in (0, -1, 100, 17):
+            del container[index]
+            del values[index]
+            self.check_list(container, values)
+        del container[10:400:3]
+        del values[10:400:3]
+        self.check_list(container, values)
+        container.extend([5, 3, 1000, 1])
+        values = sorted(values + [5, 3, 1000, 1])
+        self.check_list(container, values)
+        self.assertEqual(container[100:105], values[100:105])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
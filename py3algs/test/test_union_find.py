@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+
+
+import unittest
+import random
+# modules I've written:
+from py3algs.datastructs import union_find
+
+
+def make_unions(num_items, num_unions, seed=None):
+    # (if we use the same seed every time, we'll get the same unions)
+    rng = random.Random(seed)
+    return [(rng.randrange(num_items), rng.randrange(num_items))
+            for _ in range(num_unions)]
+
+
+def as_partition(clusters):
+    # turn clusters into something we can compare regardless of order
+    return sorted(sorted(cluster) for cluster in clusters)
+
+
+class UnionFindTestCase(unittest.TestCase):
+    """
+    Test the Union-Find implementations against each other.
+    
+    Both implementations get the same random unions, drawn using a seeded
+    random number generator, and must agree on the clusters after each one.
+    """
+    
+    def check_against_simple_impl(self, items, unions, impl):
+        """
+        Run the same unions on impl and on UnionFindSimpleImpl and compare.
+        """
+        simple = union_find.UnionFind(list(items),
+                                      impl=union_find.UnionFindSimpleImpl)
+        other = union_find.UnionFind(items, impl=impl)
+        self.assertEqual(other.items(), simple.items())
+        for a, b in unions:
+            self.assertEqual(other.joined(a, b), simple.joined(a, b))
+            simple.union(a, b)
+            other.union(a, b)
+            self.assertTrue(other.joined(a, b))
+            self.assertEqual(other.find(a), other[b])
+            self.assertEqual(other.num_clusters(), simple.num_clusters())
+        self.assertEqual(as_partition(other.clusters()),
+                         as_partition(simple.clusters()))
+    
+    def test_union_by_rank_on_integer_ids(self):
+        """
+        Test UnionFindUnionByRankAndPathCompression with range(n) items.
+        """
+        impl = union_find.UnionFindUnionByRankAndPathCompression
+        unions = make_unions(300, 400, seed=0)
+        self.check_against_simple_impl(range(300), unions, impl)
+    
+    def test_union_by_rank_on_hashable_items(self):
+        """
+        Test UnionFindUnionByRankAndPathCompression with arbitrary items.
+        """
+        impl = union_find.UnionFindUnionByRankAndPathCompression
+        items = ['item{}'.format(i) for i in range(300)]
+        unions = [(items[a], items[b]) for a, b in make_unions(300, 400, 1)]
+        self.check_against_simple_impl(items, unions, impl)
+    
+    @unittest.skipIf(union_find.numpy is None, 'needs numpy')
+    def test_bulk_operations(self):
+        """
+        Test union_many, find_many and components against single unions.
+        """
+        numpy = union_find.numpy
+        unions = make_unions(1000, 700, seed=2)
+        single = union_find.UnionFind(range(1000))
+        for a, b in unions:
+            single.union(a, b)
+        bulk = union_find.UnionFind(range(1000))
+        us, vs = numpy.array(unions).T
+        # two batches, so that the second one starts from a non-trivial forest
+        bulk.union_many(us[:300], vs[:300])
+        bulk.union_many(us[300:], vs[300:])
+        self.assertEqual(bulk.num_clusters(), single.num_clusters())
+        self.assertEqual(as_partition(bulk.clusters()),
+                         as_partition(single.clusters()))
+        labels = bulk.components()
+        self.assertEqual(labels.tolist(), [bulk.find(x) for x in range(1000)])
+        xs = numpy.arange(0, 1000, 7)
+        self.assertEqual(bulk.find_many(xs).tolist(), labels[xs].tolist())
+        self.assertRaises(KeyError, bulk.find_many, [1000])
+    
+    @unittest.skipIf(union_find.numpy is None, 'needs numpy')
+    def test_bulk_operations_on_bad_ids(self):
+        """
+        Test that bulk operations reject ids that would wrap or truncate.
+        """
+        numpy = union_find.numpy
+        ufs = union_find.UnionFind(range(10))
+        # 2**32 + 1 would wrap around to 1 in a 32-bit array
+        for bad_id in (numpy.array([2**32 + 1]), numpy.array([-1]),
+                       numpy.array([1.7]), [1.7]):
+            self.assertRaises(KeyError, ufs.union_many, bad_id, [3])
+            self.assertRaises(KeyError, ufs.union_many, [3], bad_id)
+            self.assertRaises(KeyError, ufs.find_many, bad_id)
+        self.assertEqual(ufs.num_clusters(), 10)
+        self.assertFalse(ufs.joined(1, 3))
+        # empty batches are fine
+        ufs.union_many([], [])
+        self.assertEqual(ufs.find_many([]).tolist(), [])
+        ufs.union_many(numpy.array([1], dtype=numpy.uint8), [3])
+        self.assertTrue(ufs.joined(1, 3))
+    
+    @unittest.skipIf(union_find.numpy is None, 'needs numpy')
+    def test_bulk_operations_on_long_chains(self):
+        """
+        Test union_many on path-shaped batches, which build long chains.
+        """
+        numpy = union_find.numpy
+        n = 5000
+        # a path 0 - 1 - ... - n/2-1, and a path in reverse id order
+        half = n // 2
+        path = numpy.arange(half - 1)
+        us = numpy.concatenate((path, n - 1 - path))
+        vs = numpy.concatenate((path + 1, n - 2 - path))
+        single = union_find.UnionFind(range(n))
+        for a, b in zip(us.tolist(), vs.tolist()):
+            single.union(a, b)
+        bulk = union_find.UnionFind(range(n))
+        bulk.union_many(us, vs)
+        self.assertEqual(bulk.num_clusters(), 2)
+        self.assertEqual(as_partition(bulk.clusters()),
+                         as_partition(single.clusters()))
+        # a small batch uses single finds, a big one pointer jumping
+        for xs in (numpy.array([0, half - 1, half, n - 1]), numpy.arange(n)):
+            expected = [single.find(x) == single.find(0) for x in xs.tolist()]
+            roots = bulk.find_many(xs)
+            self.assertEqual((roots == bulk.find(0)).tolist(), expected)
+        labels = bulk.components()
+        self.assertEqual(labels.tolist(), [bulk.find(x) for x in range(n)])
+        # every id points straight at its root now
+        parent, _ = bulk._impl._bulk_views()
+        self.assertTrue(numpy.array_equal(parent[parent], parent))
+    
+    def test_rollback(self):
+        """
+        Test UnionFindWithRollback, undoing unions back to snapshots.
+        """
+        impl = union_find.UnionFindWithRollback
+        unions = make_unions(200, 150, seed=3)
+        self.check_against_simple_impl(range(200), unions, impl)
+        ufs = union_find.UnionFind(range(200), impl=impl)
+        partitions, snapshots = [], []
+        for a, b in unions:
+            partitions.append(as_partition(ufs.clusters()))
+            snapshots.append(ufs.snapshot())
+            ufs.union(a, b)
+        for partition, snapshot in zip(reversed(partitions),
+                                       reversed(snapshots)):
+            ufs.rollback(snapshot)
+            self.assertEqual(as_partition(ufs.clusters()), partition)
+            self.assertEqual(ufs.num_clusters(), len(partition))
+        self.assertEqual(ufs.num_clusters(), 200)
+    
+    def test_rollback_to_earlier_snapshot(self):
+        """
+        Test rolling back past several later snapshots at once.
+        """
+        impl = union_find.UnionFindWithRollback
+        unions = make_unions(200, 150, seed=4)
+        ufs = union_find.UnionFind(range(200), impl=impl)
+        for a, b in unions[:50]:
+            ufs.union(a, b)
+        partition = as_partition(ufs.clusters())
+        num_clusters = ufs.num_clusters()
+        checkpoint = ufs.snapshot()
+        later_snapshots = []
+        for a, b in unions[50:]:
+            ufs.union(a, b)
+            later_snapshots.append(ufs.snapshot())
+        ufs.rollback(checkpoint)
+        self.assertEqual(as_partition(ufs.clusters()), partition)
+        self.assertEqual(ufs.num_clusters(), num_clusters)
+        # the later snapshots are gone now
+        self.assertRaises(ValueError, ufs.rollback, later_snapshots[-1])
+        self.assertRaises(ValueError, ufs.rollback, -1)
+        # and we can keep going from the checkpoint
+        for a, b in unions[50:]:
+            ufs.union(a, b)
+        single = union_find.UnionFind(range(200))
+        for a, b in unions:
+            single.union(a, b)
+        self.assertEqual(as_partition(ufs.clusters()),
+                         as_partition(single.clusters()))
+    
+    def test_default_impl(self):
+        """
+        Test that the default implementation is the faster one.
+        """
+        ufs = union_find.UnionFind(range(10))
+        self.assertIsInstance(
+            ufs._impl, union_find.UnionFindUnionByRankAndPathCompression)
+        self.assertRaises(KeyError, ufs.find, 10)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()